@@ -1,79 +1,239 @@
 import zipfile
 import time
 import io
+import struct
+import os
+import json
+import base64
+import argparse
 from multiprocessing import Pool, cpu_count
 
 CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789'
 LETTERS = 'abcdefghijklmnopqrstuvwxyz'
 DIGITS = '0123456789'
 
+# 병렬 분할 모드에서 워커 하나가 한 번에 맡는 인덱스 구간 크기
+PARTITION_SIZE = 200000
+
+# 체크포인트 파일 경로와 기본 저장 주기(초)
+CHECKPOINT_FILE = 'checkpoint.json'
+CHECKPOINT_INTERVAL = 30
+
+# 자리별 문자집합 패턴 (예: 영문3 + 숫자3 → LETTERS x3, DIGITS x3)
+def _pattern(head, head_len, tail, tail_len):
+    return (head,) * head_len + (tail,) * tail_len
+
+# 단계별 키 공간: 패턴 리스트 (인덱스는 패턴 순서대로 이어 붙임)
+STAGES = [
+    ('[1단계] 영문3 + 숫자3', [_pattern(LETTERS, 3, DIGITS, 3)]),
+    ('[2단계] 영문4 + 숫자2', [_pattern(LETTERS, 4, DIGITS, 2)]),
+    ('[3단계] 영문5 + 숫자1', [_pattern(LETTERS, 5, DIGITS, 1)]),
+    ('[4단계] 숫자3 + 영문3', [_pattern(DIGITS, 3, LETTERS, 3)]),
+    ('[5단계] 숫자4 + 영문2', [_pattern(DIGITS, 4, LETTERS, 2)]),
+    ('[6단계] 숫자5 + 영문1', [_pattern(DIGITS, 5, LETTERS, 1)]),
+]
+
+# 7단계: 영문/숫자 모양 64가지 중 1~6단계에서 다루지 않은 모양만 나열
+# (이미 시도한 비밀번호를 제외 방식으로 건너뛰므로 tried 집합이나 멤버십 검사가 필요 없음)
+def _remaining_patterns():
+    covered = [pattern for _, patterns in STAGES for pattern in patterns]
+    remaining = []
+    for mask in range(64):
+        pattern = tuple(LETTERS if mask >> (5 - i) & 1 else DIGITS for i in range(6))
+        if pattern not in covered:
+            remaining.append(pattern)
+    return remaining
+
+STAGES.append(('[7단계] 나머지 전체 조합', _remaining_patterns()))
+
 # zip 파일을 메모리에 한번만 로딩
 with open('emergency_storage_key.zip', 'rb') as f:
     zip_bytes = f.read()
 
+# ZipCrypto 키 갱신에 쓰는 CRC32 테이블
+def _make_crc_table():
+    table = []
+    for n in range(256):
+        c = n
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        table.append(c)
+    return table
+
+CRC_TABLE = _make_crc_table()
+
+# 중앙 디렉터리는 한 번만 파싱해서 엔트리별 12바이트 암호화 헤더와 검사 바이트만 보관
+def load_encryption_headers(data):
+    entries = []
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        for info in zf.infolist():
+            if not info.flag_bits & 0x1:
+                continue
+            offset = info.header_offset
+            name_len, extra_len = struct.unpack('<HH', data[offset + 26:offset + 30])
+            start = offset + 30 + name_len + extra_len
+            # 데이터 디스크립터를 쓰는 엔트리는 CRC 대신 수정 시각 상위 바이트로 검사
+            if info.flag_bits & 0x8:
+                h, m, sec = info.date_time[3:]
+                check = (((h << 11) | (m << 5) | (sec // 2)) >> 8) & 0xff
+            else:
+                check = (info.CRC >> 24) & 0xff
+            entries.append((data[start:start + 12], check))
+    return entries
+
+ENCRYPTION_HEADERS = load_encryption_headers(zip_bytes)
+
+# 12바이트 헤더만 복호화해서 마지막 바이트가 검사 바이트와 같은지 확인
+def check_header(pwd, header, check):
+    table = CRC_TABLE
+    k0, k1, k2 = 0x12345678, 0x23456789, 0x34567890
+    for c in pwd:
+        k0 = (k0 >> 8) ^ table[(k0 ^ c) & 0xff]
+        k1 = ((k1 + (k0 & 0xff)) * 134775813 + 1) & 0xffffffff
+        k2 = (k2 >> 8) ^ table[(k2 ^ (k1 >> 24)) & 0xff]
+    p = 0
+    for c in header:
+        t = k2 | 2
+        p = c ^ (((t * (t ^ 1)) >> 8) & 0xff)
+        k0 = (k0 >> 8) ^ table[(k0 ^ p) & 0xff]
+        k1 = ((k1 + (k0 & 0xff)) * 134775813 + 1) & 0xffffffff
+        k2 = (k2 >> 8) ^ table[(k2 ^ (k1 >> 24)) & 0xff]
+    return p == check
+
 # ✅ 비밀번호를 찾으면 문자열을 리턴 (파일 저장은 하지 않음)
 def try_password(pw):
+    pwd = bytes(pw, 'utf-8')
+    # 빠른 경로: 헤더 검사로 대부분의 오답을 zip 파싱 없이 걸러냄
+    for header, check in ENCRYPTION_HEADERS:
+        if not check_header(pwd, header, check):
+            return None
+    # 헤더를 통과한 소수의 후보만 전체 복호화 + CRC 검증 (디스크에는 쓰지 않음)
     try:
         with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
-            zf.extractall(pwd=bytes(pw, 'utf-8'))
+            for info in zf.infolist():
+                zf.read(info, pwd=pwd)
             return pw  # ✅ 비밀번호를 리턴
     except:
         return None
 
-# 중첩 루프 생성기 (itertools 없이 직접 구현)
-def _nested_loop(charset, repeat):
-    if repeat == 1:
-        for a in charset:
-            yield [a]
-    elif repeat == 2:
-        for a in charset:
-            for b in charset:
-                yield [a, b]
-    elif repeat == 3:
-        for a in charset:
-            for b in charset:
-                for c in charset:
-                    yield [a, b, c]
-    elif repeat == 4:
-        for a in charset:
-            for b in charset:
-                for c in charset:
-                    for d in charset:
-                        yield [a, b, c, d]
-    elif repeat == 5:
-        for a in charset:
-            for b in charset:
-                for c in charset:
-                    for d in charset:
-                        for e in charset:
-                            yield [a, b, c, d, e]
-    elif repeat == 6:
-        for a in charset:
-            for b in charset:
-                for c in charset:
-                    for d in charset:
-                        for e in charset:
-                            for f in charset:
-                                yield [a, b, c, d, e, f]
-
-def generate_letters_digits(letter_len, digit_len, label):
-    print(label)
-    for a in _nested_loop(LETTERS, letter_len):
-        for b in _nested_loop(DIGITS, digit_len):
-            yield ''.join(a + b)
+def _pattern_size(pattern):
+    size = 1
+    for charset in pattern:
+        size *= len(charset)
+    return size
 
-def generate_digits_letters(digit_len, letter_len, label):
-    print(label)
-    for a in _nested_loop(DIGITS, digit_len):
-        for b in _nested_loop(LETTERS, letter_len):
-            yield ''.join(a + b)
+def keyspace_size(patterns):
+    return sum(_pattern_size(pattern) for pattern in patterns)
+
+# 전체 인덱스를 (패턴 번호, 패턴 안의 인덱스)로 변환
+def _locate(patterns, index):
+    for i, pattern in enumerate(patterns):
+        size = _pattern_size(pattern)
+        if index < size:
+            return i, index
+        index -= size
+    raise IndexError('키 공간 범위를 벗어난 인덱스입니다.')
+
+# 인덱스를 자리별 문자 위치로 변환 (마지막 자리가 가장 빠르게 변함)
+def _index_to_digits(pattern, index):
+    digits = [0] * len(pattern)
+    for pos in range(len(pattern) - 1, -1, -1):
+        index, digits[pos] = divmod(index, len(pattern[pos]))
+    return digits
+
+def index_to_password(patterns, index):
+    i, local = _locate(patterns, index)
+    pattern = patterns[i]
+    return ''.join(pattern[pos][d] for pos, d in enumerate(_index_to_digits(pattern, local)))
 
-def generate_remaining_combinations(tried):
-    print('[7단계] 나머지 전체 조합')
-    for a in _nested_loop(CHARS, 6):
-        pw = ''.join(a)
-        if pw not in tried:
-            yield pw
+# 한 패턴 안에서 start번째부터 count개를 오도미터처럼 마지막 자리부터 1씩 올리며 생성
+def _generate_pattern(pattern, start, count):
+    digits = _index_to_digits(pattern, start)
+    for _ in range(count):
+        yield ''.join(pattern[pos][d] for pos, d in enumerate(digits))
+        pos = len(digits) - 1
+        while pos >= 0:
+            digits[pos] += 1
+            if digits[pos] < len(pattern[pos]):
+                break
+            digits[pos] = 0
+            pos -= 1
+
+# 구간의 start ~ end-1 번째 비밀번호를 워커 안에서 직접 생성 (패턴 경계를 넘어가도 됨)
+def generate_range(patterns, start, end):
+    if start >= end:
+        return
+    i, local = _locate(patterns, start)
+    remaining = end - start
+    while remaining > 0:
+        count = min(remaining, _pattern_size(patterns[i]) - local)
+        yield from _generate_pattern(patterns[i], local, count)
+        remaining -= count
+        i, local = i + 1, 0
+
+# 단계별로 끝난 구간을 비트 하나씩으로 기록하는 체크포인트
+class Checkpoint:
+    def __init__(self, path=CHECKPOINT_FILE, interval=CHECKPOINT_INTERVAL, partition=PARTITION_SIZE):
+        self.path = path
+        self.interval = interval
+        self.partition = partition
+        self.stage = 0
+        self.total_attempts = 0
+        self.bitmaps = {}  # 단계 번호 -> bytearray (구간 하나당 1비트)
+        self._last_save = time.time()
+
+    def _bitmap(self, stage):
+        if stage not in self.bitmaps:
+            count = -(-keyspace_size(STAGES[stage][1]) // self.partition)
+            self.bitmaps[stage] = bytearray((count + 7) // 8)
+        return self.bitmaps[stage]
+
+    def mark_done(self, stage, start):
+        i = start // self.partition
+        self._bitmap(stage)[i >> 3] |= 1 << (i & 7)
+
+    def is_done(self, stage, start):
+        i = start // self.partition
+        return bool(self._bitmap(stage)[i >> 3] & (1 << (i & 7)))
+
+    def save(self):
+        data = {
+            'stage': self.stage,
+            'total_attempts': self.total_attempts,
+            'partition': self.partition,
+            'bitmaps': {str(k): base64.b64encode(v).decode() for k, v in self.bitmaps.items()},
+        }
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)  # 저장 도중 죽어도 이전 체크포인트는 유지
+        self._last_save = time.time()
+
+    def maybe_save(self):
+        if time.time() - self._last_save >= self.interval:
+            self.save()
+
+    def load(self):
+        with open(self.path) as f:
+            data = json.load(f)
+        self.stage = data['stage']
+        self.total_attempts = data['total_attempts']
+        self.partition = data['partition']
+        self.bitmaps = {int(k): bytearray(base64.b64decode(v)) for k, v in data['bitmaps'].items()}
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# 워커: 인덱스 구간만 받아서 후보를 만들고, 찾은 비밀번호와 시도 횟수만 돌려줌
+def search_range(task):
+    patterns, start, end = task
+    count = 0
+    for pw in generate_range(patterns, start, end):
+        count += 1
+        if try_password(pw):
+            return start, pw, count
+    return start, None, count
 
 # ✅ 비밀번호 저장은 메인 프로세스에서만 수행
 def save_password(pw):
@@ -82,48 +242,59 @@ def save_password(pw):
     print(f'✅ 비밀번호를 찾았습니다: {pw}')
     print('📁 password.txt에 저장 완료')
 
-def run_strategy(generator, tried_set=None, use_parallel=True, chunk=10000, global_start=None, total_attempts=None):
-    if use_parallel:
-        with Pool(cpu_count()) as pool:
-            for result in pool.imap_unordered(try_password, generator, chunksize=chunk):
-                total_attempts[0] += 1
-                if total_attempts[0] % 100000 == 0:
-                    print(f'{total_attempts[0]}회 시도됨... 누적 경과 시간: {time.time() - global_start:.2f}초')
-                if result:  # result는 성공한 비밀번호 문자열
-                    pool.terminate()
-                    save_password(result)  # ✅ 여기서 저장
-                    return True
-    else:
-        for pw in generator:
-            total_attempts[0] += 1
-            result = try_password(pw)
-            if result:
-                save_password(result)
+# 후보 문자열 대신 인덱스 구간만 워커에 넘겨서 프로세스 간 통신을 최소화
+def run_strategy(stage, checkpoint, use_parallel=True, global_start=None):
+    label, patterns = STAGES[stage]
+    print(label)
+    size = keyspace_size(patterns)
+    partition = checkpoint.partition
+    tasks = ((patterns, start, min(start + partition, size))
+             for start in range(0, size, partition) if not checkpoint.is_done(stage, start))
+
+    pool = Pool(cpu_count()) if use_parallel else None
+    results = pool.imap_unordered(search_range, tasks) if pool else map(search_range, tasks)
+    try:
+        for start, found, count in results:
+            checkpoint.total_attempts += count
+            print(f'{checkpoint.total_attempts}회 시도됨... 누적 경과 시간: {time.time() - global_start:.2f}초')
+            if found:
+                save_password(found)
                 return True
-            if tried_set is not None:
-                tried_set.add(pw)
-            if total_attempts[0] % 1000 == 0:
-                print(f'{total_attempts[0]}회 시도됨... 누적 경과 시간: {time.time() - global_start:.2f}초')
+            checkpoint.mark_done(stage, start)
+            checkpoint.maybe_save()
+    finally:
+        if pool:
+            pool.terminate()
     return False
 
-def unlock_zip():
+def unlock_zip(use_parallel=True, resume=False, interval=CHECKPOINT_INTERVAL):
     print('비밀번호 해제 시작')
     global_start = time.time()
     print('시작 시간:', time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(global_start)))
-    tried = set()
-    total_attempts = [0]
-
-    if run_strategy(generate_letters_digits(3, 3, '[1단계] 영문3 + 숫자3'), tried, global_start=global_start, total_attempts=total_attempts): return
-    if run_strategy(generate_letters_digits(4, 2, '[2단계] 영문4 + 숫자2'), tried, global_start=global_start, total_attempts=total_attempts): return
-    if run_strategy(generate_letters_digits(5, 1, '[3단계] 영문5 + 숫자1'), tried, global_start=global_start, total_attempts=total_attempts): return
 
-    if run_strategy(generate_digits_letters(3, 3, '[4단계] 숫자3 + 영문3'), tried, global_start=global_start, total_attempts=total_attempts): return
-    if run_strategy(generate_digits_letters(4, 2, '[5단계] 숫자4 + 영문2'), tried, global_start=global_start, total_attempts=total_attempts): return
-    if run_strategy(generate_digits_letters(5, 1, '[6단계] 숫자5 + 영문1'), tried, global_start=global_start, total_attempts=total_attempts): return
+    checkpoint = Checkpoint(interval=interval)
+    if resume and os.path.exists(checkpoint.path):
+        checkpoint.load()
+        print(f'체크포인트에서 이어서 시작: {STAGES[checkpoint.stage][0]} ({checkpoint.total_attempts}회 시도 완료)')
 
-    if run_strategy(generate_remaining_combinations(tried), global_start=global_start, total_attempts=total_attempts): return
+    try:
+        for stage in range(checkpoint.stage, len(STAGES)):
+            checkpoint.stage = stage
+            if run_strategy(stage, checkpoint, use_parallel, global_start):
+                checkpoint.remove()
+                return
+    except KeyboardInterrupt:
+        checkpoint.save()
+        print(f'\n중단됨. 진행 상황을 {checkpoint.path}에 저장했습니다. --resume 으로 이어서 실행하세요.')
+        return
 
+    checkpoint.remove()
     print('❌ 비밀번호를 찾지 못했습니다.')
 
 if __name__ == '__main__':
-    unlock_zip()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resume', action='store_true', help='체크포인트에서 이어서 실행')
+    parser.add_argument('--interval', type=int, default=CHECKPOINT_INTERVAL, help='체크포인트 저장 주기(초)')
+    parser.add_argument('--serial', action='store_true', help='멀티프로세싱 없이 실행')
+    args = parser.parse_args()
+    unlock_zip(use_parallel=not args.serial, resume=args.resume, interval=args.interval)
@@ -1,13 +1,119 @@
+import os
+import csv
+import sys
+import glob
+import time
+import argparse
+import string
+from multiprocessing import Pool, cpu_count
+
+LOWER = string.ascii_lowercase
+UPPER = string.ascii_uppercase
+
+# 대용량 파일을 나눠 읽을 때의 청크 크기 (바이트)
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# 자동 탐지 시 앞부분만 샘플링하는 길이 (문자 수) → 파일 크기와 무관하게 일정한 시간
+SAMPLE_SIZE = 64 * 1024
+
+# 영어 알파벳 빈도 (%, a~z)
+ENGLISH_FREQ = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+
+# 보너스: 평문에 포함될 수 있는 단어 사전 (짧은 암호문에서 통계 점수를 보완)
+DICTIONARY = ['mars', 'emergency', 'security', 'key', 'station', 'mission']
+
+# 빈도 신호가 약하다고 보는 기준: 글자 수가 이보다 적거나, 2순위 점수가 1순위의 이 배수보다 작을 때
+MIN_LETTERS = 200
+CLEAR_MARGIN = 2.0
+
+
+# shift별 변환 테이블을 미리 한 번만 만들어 둠 (문자 단위 루프/문자열 누적 제거)
+def _shifted(alphabet, shift):
+    return alphabet[shift:] + alphabet[:shift]
+
+
+DECODE_TABLES = [
+    str.maketrans(LOWER + UPPER, _shifted(LOWER, -shift % 26) + _shifted(UPPER, -shift % 26))
+    for shift in range(26)
+]
+DECODE_BYTE_TABLES = [
+    bytes.maketrans((LOWER + UPPER).encode(), (_shifted(LOWER, -shift % 26) + _shifted(UPPER, -shift % 26)).encode())
+    for shift in range(26)
+]
+
+
 def caesar_cipher_decode(target_text, shift):
-    decoded = ''
-    for char in target_text:
-        if 'a' <= char <= 'z':
-            decoded += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-        elif 'A' <= char <= 'Z':
-            decoded += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-        else:
-            decoded += char
-    return decoded
+    return target_text.translate(DECODE_TABLES[shift % 26])
+
+
+def decode_all_shifts(target_text):
+    """0~25 전체 shift의 해독 결과를 리스트로 반환"""
+    return [target_text.translate(table) for table in DECODE_TABLES]
+
+
+def letter_histogram(text):
+    """a~z 등장 횟수 (대소문자 구분 없음)"""
+    lower_text = text.lower()
+    return [lower_text.count(letter) for letter in LOWER]
+
+
+def rank_shifts(target_text, sample_size=SAMPLE_SIZE):
+    """앞부분 샘플의 글자 빈도를 한 번만 세고, 26개 shift를 카이제곱 점수로 평가해
+    (shift, 점수) 리스트를 점수가 낮은(영어에 가까운) 순서로 반환"""
+    histogram = letter_histogram(target_text[:sample_size])
+    total = sum(histogram)
+    ranking = []
+    for shift in range(26):
+        score = 0.0
+        if total:
+            for i, freq in enumerate(ENGLISH_FREQ):
+                expected = total * freq / 100
+                # shift만큼 밀린 암호문 글자가 평문 글자 i가 됨
+                observed = histogram[(i + shift) % 26]
+                score += (observed - expected) ** 2 / expected
+        ranking.append((shift, score))
+    ranking.sort(key=lambda item: item[1])
+    return ranking
+
+
+def detect_shift(target_text, sample_size=SAMPLE_SIZE):
+    """카이제곱 1순위를 해독 키로 선택. 빈도 신호가 약할 때(짧은 글, 1·2순위 점수 차이가 작음)만
+    사전 단어가 보이는 shift를 우선한다 (긴 글에서는 'key' 같은 짧은 단어가 엉뚱한 shift에서도 나옴)"""
+    ranking = rank_shifts(target_text, sample_size)
+    sample = target_text[:sample_size]
+    letters = sum(letter_histogram(sample))
+    best, second = ranking[0][1], ranking[1][1]
+    if letters >= MIN_LETTERS and second >= best * CLEAR_MARGIN:
+        return ranking[0][0], ranking
+    for shift, _ in ranking:
+        lower_decoded = caesar_cipher_decode(sample, shift).lower()
+        if any(word in lower_decoded for word in DICTIONARY):
+            return shift, ranking
+    return ranking[0][0], ranking
+
+
+def decode_file_all_shifts(input_path, output_dir='decoded', chunk_size=CHUNK_SIZE):
+    """큰 파일을 청크 단위로 읽으면서 26개 후보를 각각 파일로 저장 (메모리 사용량은 청크 크기만큼)
+
+    바이트 단위로 변환하므로 UTF-8의 멀티바이트 문자(0x80 이상)는 그대로 유지된다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = [open(os.path.join(output_dir, f'result_{shift:02d}.txt'), 'wb') for shift in range(26)]
+    try:
+        with open(input_path, 'rb') as source:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                for table, output in zip(DECODE_BYTE_TABLES, outputs):
+                    output.write(chunk.translate(table))
+    finally:
+        for output in outputs:
+            output.close()
+    return [output.name for output in outputs]
 
 
 def main():
@@ -24,41 +130,98 @@ def main():
     print('[카이사르 암호 해독 시작]')
     print('-------------------------------')
 
-    # 보너스: 평문에 포함될 수 있는 단어 사전
-    dictionary = ['mars', 'emergency', 'security', 'key', 'station', 'mission']
-
-    for shift in range(0, 26):  # ✅ shift=0 포함
-        decoded_text = caesar_cipher_decode(encrypted_text, shift)
-        print(f'{shift:2d} ▶ {decoded_text}')
+    shift, ranking = detect_shift(encrypted_text)
+    for rank_shift, score in ranking:
+        preview = caesar_cipher_decode(encrypted_text[:60], rank_shift)
+        print(f'{rank_shift:2d} ▶ {preview}  (χ²={score:.1f})')
 
-        # 자동 키워드 탐지
-        lower_decoded = decoded_text.lower()
-        if any(word in lower_decoded for word in dictionary):
-            print(f'사전 단어 발견! 해독 키: {shift}')
-            save_result(decoded_text)
-            return
+    print(f'자동 탐지 완료! 해독 키: {shift}')
+    save_result(caesar_cipher_decode(encrypted_text, shift))
 
-    print('자동 탐지 실패. 사람이 직접 해독 키를 선택해야 합니다.')
 
+def save_result(decoded_text, filename='result.txt', raise_errors=False):
+    """raise_errors=True면 오류를 출력하지 않고 그대로 올려 보냄 (일괄 모드에서 summary에 기록)"""
     try:
-        user_shift = int(input('해독 키 입력 (0~25): '))
-        if not 0 <= user_shift <= 25:
-            print('유효한 숫자를 입력하세요.')
-            return
-        final_decoded = caesar_cipher_decode(encrypted_text, user_shift)
-        save_result(final_decoded)
-    except ValueError:
-        print('숫자만 입력 가능합니다.')
+        with open(filename, 'w', encoding='utf-8') as result_file:
+            result_file.write(decoded_text)
+        print(f'{filename}에 저장 완료!')
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f'파일 저장 중 오류 발생: {e}')
+
+
+def collect_input_files(targets):
+    """디렉터리는 안의 .txt 파일 전체, 그 외에는 glob 패턴으로 해석"""
+    files = []
+    for target in targets:
+        if os.path.isdir(target):
+            files.extend(sorted(glob.glob(os.path.join(target, '*.txt'))))
+        else:
+            files.extend(sorted(glob.glob(target)))
+    return files
 
 
-def save_result(decoded_text):
+def decode_one(task):
+    """워커: 파일 하나를 읽어 해독 키를 찾고 결과 파일을 저장한 뒤 요약 정보를 반환"""
+    input_path, output_path = task
+    start = time.perf_counter()
     try:
-        with open('result.txt', 'w', encoding='utf-8') as result_file:
-            result_file.write(decoded_text)
-        print('result.txt에 저장 완료!')
+        with open(input_path, 'r', encoding='utf-8') as file:
+            encrypted_text = file.read().strip()
+        shift, _ = detect_shift(encrypted_text)
+        save_result(caesar_cipher_decode(encrypted_text, shift), output_path, raise_errors=True)
+        return input_path, shift, time.perf_counter() - start, output_path, ''
     except Exception as e:
-        print(f'파일 저장 중 오류 발생: {e}')
+        return input_path, '', time.perf_counter() - start, '', str(e)
+
+
+def decode_batch(targets, output_dir='results', workers=None, summary_name='summary.csv'):
+    """여러 암호문 파일을 프로세스 풀로 나눠 해독하고 summary.csv에 파일별 해독 키/소요 시간 기록"""
+    files = collect_input_files(targets)
+    if not files:
+        print('해독할 파일이 없습니다.')
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    # 같은 이름의 파일이 여러 디렉터리에 있어도 결과가 덮어써지지 않도록 번호를 붙임
+    tasks = []
+    seen = {}
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        count = seen.get(stem, 0)
+        seen[stem] = count + 1
+        name = f'{stem}_result.txt' if count == 0 else f'{stem}_{count}_result.txt'
+        tasks.append((path, os.path.join(output_dir, name)))
+
+    print(f'[일괄 해독 시작] 파일 {len(files)}개')
+    with Pool(workers or cpu_count()) as pool:
+        rows = pool.map(decode_one, tasks)
+
+    summary_path = os.path.join(output_dir, summary_name)
+    with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['file', 'shift', 'seconds', 'result', 'error'])
+        for path, shift, seconds, output_path, error in rows:
+            writer.writerow([path, shift, f'{seconds:.4f}', output_path, error])
+    print(f'{summary_path}에 요약 저장 완료!')
+    return rows
 
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description='카이사르 암호 일괄 해독')
+        parser.add_argument('targets', nargs='*', help='암호문 파일, 디렉터리 또는 glob 패턴')
+        parser.add_argument('-o', '--output-dir', default=None, help='결과 저장 폴더 (기본: results, --all-shifts는 decoded)')
+        parser.add_argument('-w', '--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+        parser.add_argument('--all-shifts', metavar='FILE', help='큰 파일을 청크 단위로 읽어 26개 shift 결과를 모두 저장')
+        args = parser.parse_args()
+        if args.all_shifts:
+            names = decode_file_all_shifts(args.all_shifts, args.output_dir or 'decoded')
+            print(f'{len(names)}개 후보를 {os.path.dirname(names[0])}에 저장 완료!')
+        elif args.targets:
+            decode_batch(args.targets, args.output_dir or 'results', args.workers)
+        else:
+            parser.error('암호문 파일 또는 --all-shifts FILE 을 지정하세요.')
+    else:
+        main()
@@ -0,0 +1,99 @@
+import time
+import random
+import argparse
+import tracemalloc
+from calculator_core import CalculatorCore
+
+# 계산기 버튼 전체
+DIGITS = '0123456789'
+OPERATORS = ['+', '-', '×', '÷']
+FUNCTIONS = ['AC', '+/-', '%', '.', '=']
+KEYS = list(DIGITS) + OPERATORS + FUNCTIONS
+
+
+# 무작위 키 입력 시퀀스 (숫자가 자주 나오도록 가중치)
+def random_sequence(rng, length):
+    weights = [6] * len(DIGITS) + [2] * len(OPERATORS) + [1] * len(FUNCTIONS)
+    return rng.choices(KEYS, weights=weights, k=length)
+
+
+# 극단적인 입력 시퀀스 모음 (이름, 키 리스트)
+def adversarial_sequences(length):
+    half = max(length // 2, 1)
+    return [
+        ('long_number', ['9'] * length + ['=']),
+        ('long_decimal', ['0', '.'] + ['3'] * length + ['×', '3', '=']),
+        ('huge_product', ['9'] * 50 + ['×'] + ['9'] * 50 + ['='] + ['×', '9', '9', '9', '='] * half),
+        ('long_expression', ['1', '+'] * half + ['1', '=']),
+        ('operator_spam', ['5'] + OPERATORS * half + ['2', '=']),
+        ('percent_chain', ['7'] + ['%'] * length),
+        ('sign_flip', ['4', '2'] + ['+/-'] * length),
+        ('divide_by_zero', ['1', '÷', '0', '='] * half),
+        ('repeat_equal', ['2', '×', '3'] + ['='] * length),
+    ]
+
+
+# 시퀀스 하나를 실행하며 키 입력별 지연 시간과 최대 메모리 측정
+def run_sequence(keys):
+    core = CalculatorCore()
+    latencies = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for key in keys:
+        t = time.perf_counter()
+        core.press(key)
+        core.display()
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # 퍼지 검사: 어떤 입력에서도 예외 없이 문자열이 표시되어야 함
+    display = core.display()
+    assert isinstance(display, str) and display, '표시 문자열이 비어 있습니다.'
+    return elapsed, peak, latencies, display
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def report(name, keys, elapsed, peak, latencies, display):
+    latencies = sorted(latencies)
+    ops = len(keys) / elapsed if elapsed else float('inf')
+    p50, p95, p99 = (percentile(latencies, p) * 1e6 for p in (50, 95, 99))
+    shown = display if len(display) <= 20 else display[:17] + '...'
+    print(f'{name:<16} {len(keys):>7} {ops:>12.0f} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} '
+          f'{latencies[-1] * 1e6 if latencies else 0:>10.1f} {peak / 1024:>10.1f}  {shown}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CalculatorCore 키 입력 벤치마크 / 퍼지 테스트')
+    parser.add_argument('--sessions', type=int, default=200, help='무작위 시퀀스 개수')
+    parser.add_argument('--length', type=int, default=10000, help='시퀀스 길이 (키 입력 수)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+
+    print(f'{"sequence":<16} {"keys":>7} {"ops/sec":>12} {"p50(us)":>9} {"p95(us)":>9} {"p99(us)":>9} '
+          f'{"max(us)":>10} {"peak(KB)":>10}  display')
+
+    for name, keys in adversarial_sequences(args.length):
+        report(name, keys, *run_sequence(keys))
+
+    # 무작위 시퀀스는 전체를 모아서 한 줄로 요약
+    rng = random.Random(args.seed)
+    total_keys, total_time, max_peak, all_latencies = 0, 0.0, 0, []
+    for _ in range(args.sessions):
+        keys = random_sequence(rng, rng.randint(1, args.length // 10 or 1))
+        elapsed, peak, latencies, _ = run_sequence(keys)
+        total_keys += len(keys)
+        total_time += elapsed
+        max_peak = max(max_peak, peak)
+        all_latencies.extend(latencies)
+    report(f'random x{args.sessions}', range(total_keys), total_time, max_peak, all_latencies, '-')
+
+
+if __name__ == '__main__':
+    main()
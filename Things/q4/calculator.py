@@ -1,118 +1,17 @@
 import sys
-from math import isfinite
 from functools import partial
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QFontMetrics
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QGridLayout, QLineEdit, QPushButton, QSizePolicy
+from calculator_core import CalculatorCore
 
-# 계산 로직 클래스: 숫자 입력, 연산자 처리, 결과 계산 담당
-class CalculatorCore:
-    def __init__(self):
-        self.reset()
-
-    # 상태 초기화
-    def reset(self):
-        self._current = '0'
-        self._operand = None
-        self._operator = None
-        self._just_evaluated = False
-        self._expression = ''
-
-    # 숫자 입력 처리
-    def input_digit(self, d):
-        if self._just_evaluated:
-            self._current, self._expression, self._just_evaluated = d, '', False
-        elif self._current == '0':
-            self._current = d
-        else:
-            self._current += d
-
-    # 소수점 입력 처리
-    def input_decimal(self):
-        if self._just_evaluated:
-            self._current, self._expression, self._just_evaluated = '0.', '', False
-        elif '.' not in self._current:
-            self._current += '.'
-
-    # 부호 반전
-    def negative_positive(self):
-        if self._current.startswith('-'):
-            self._current = self._current[1:]
-        elif self._current != '0':
-            self._current = '-' + self._current
-
-    # 퍼센트 처리
-    def percent(self):
-        try:
-            self._current = self._format(float(self._current) / 100)
-        except:
-            self._current = 'Error'
-
-    # 연산자 설정 및 처리
-    def set_operator(self, op):
-        if self._just_evaluated:
-            self._operand = float(self._current)
-            self._just_evaluated = False
-        elif self._operator:
-            self._calculate()
-        else:
-            self._operand = float(self._current)
-
-        if self._expression and self._expression[-1] in '+-×÷':
-            self._expression = self._expression[:-1]
-        else:
-            self._expression = self._format(self._operand)
-
-        self._operator = op
-        symbol = {'+': '+', '-': '-', '*': '×', '/': '÷'}[op]
-        self._expression += symbol
-        self._current = '0'
-
-    # = 버튼 처리
-    def equal(self):
-        if self._operator:
-            self._calculate()
-            self._operator = None
-            self._expression = ''
-            self._just_evaluated = True
-
-    # 출력할 문자열 반환
-    def display(self):
-        return self._expression + self._current if self._expression else self._current
-
-    # 사칙연산 수행
-    def _calculate(self):
-        try:
-            a = self._operand
-            b = float(self._current)
-            if self._operator == '+':
-                r = a + b
-            elif self._operator == '-':
-                r = a - b
-            elif self._operator == '*':
-                r = a * b
-            elif self._operator == '/':
-                if b == 0:
-                    raise ZeroDivisionError
-                r = a / b
-            else:
-                return
-
-            if not isfinite(r):
-                raise OverflowError
-
-            self._operand = r
-            self._current = self._format(r)
-        except ZeroDivisionError:
-            self._current, self._operand = 'Divide by 0', None
-        except OverflowError:
-            self._current, self._operand = 'Overflow', None
-        except:
-            self._current, self._operand = 'Error', None
-
-    # 결과 포맷 (소수점 6자리 반올림, 불필요한 0 제거)
-    def _format(self, v):
-        return format(round(v, 6), '.6f').rstrip('0').rstrip('.') or '0'
+# 폰트 크기 범위와 맞춤 결과 캐시 최대 개수
+MAX_FONT_SIZE = 32
+MIN_FONT_SIZE = 10
+FIT_CACHE_LIMIT = 1024
+
+# Arial 숫자는 모두 같은 폭이므로 0으로 통일해서 캐시 키로 사용 (글자 종류별 모양만 남김)
+DIGIT_CLASS = str.maketrans('123456789', '000000000')
 
 # UI 클래스: 버튼 및 화면 구성
 class Calculator(QWidget):
@@ -126,6 +25,8 @@ class Calculator(QWidget):
     def __init__(self):
         super().__init__()
         self.core = CalculatorCore()
+        self._fonts = {}      # 크기 → (QFont, QFontMetrics), 크기마다 한 번만 생성
+        self._fit_cache = {}  # (글자 모양, 표시 폭) → 맞는 폰트 크기
         self._init_ui()
 
     # UI 초기 설정
@@ -162,21 +63,7 @@ class Calculator(QWidget):
             btn.setFixedHeight(60)
 
             # 버튼 기능 연결
-            if text.isdigit():
-                handler = partial(self.core.input_digit, text)
-            elif text == '.':
-                handler = self.core.input_decimal
-            elif text in ['+', '-', '×', '÷']:
-                op_map = {'×': '*', '÷': '/', '+': '+', '-': '-'}
-                handler = partial(self.core.set_operator, op_map[text])
-            elif text == '=':
-                handler = self.core.equal
-            else:
-                handler = {
-                    'AC': self.core.reset,
-                    '+/-': self.core.negative_positive,
-                    '%': self.core.percent
-                }[text]
+            handler = partial(self.core.press, text)
 
             btn.clicked.connect(lambda _, h=handler: (h(), self._update()))
 
@@ -209,18 +96,35 @@ class Calculator(QWidget):
         self.display.setText(self.core.display())
         self._adjust_font()
 
-    # 텍스트 길이에 따라 폰트 크기 조절
+    # 크기별 폰트와 폰트 메트릭 (캐시)
+    def _font(self, size):
+        if size not in self._fonts:
+            font = QFont("Arial")
+            font.setPointSize(size)
+            self._fonts[size] = (font, QFontMetrics(font))
+        return self._fonts[size]
+
+    # 텍스트 길이에 따라 폰트 크기 조절 (캐시 확인 후 이진 탐색)
     def _adjust_font(self):
         text = self.display.text()
-        font = QFont("Arial")
         width = self.display.width() - 20
-        size = 32
-        while size >= 10:
-            font.setPointSize(size)
-            if QFontMetrics(font).horizontalAdvance(text) <= width:
-                break
-            size -= 1
-        self.display.setFont(font)
+        key = (text.translate(DIGIT_CLASS), width)
+        size = self._fit_cache.get(key)
+        if size is None:
+            # 폭에 들어가는 가장 큰 크기 찾기 (하나도 안 맞으면 최소 크기)
+            low, high = MIN_FONT_SIZE, MAX_FONT_SIZE
+            while low < high:
+                mid = (low + high + 1) // 2
+                if self._font(mid)[1].horizontalAdvance(text) <= width:
+                    low = mid
+                else:
+                    high = mid - 1
+            size = low
+            if len(self._fit_cache) >= FIT_CACHE_LIMIT:
+                self._fit_cache.clear()
+            self._fit_cache[key] = size
+        if self.display.font().pointSize() != size:
+            self.display.setFont(self._font(size)[0])
 
 # 실행 함수
 def main():
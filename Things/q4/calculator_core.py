@@ -0,0 +1,295 @@
+import sys
+from fractions import Fraction
+from decimal import Decimal
+from functools import lru_cache
+
+# 화면에 표시되는 오류 메시지
+ERRORS = ('Error', 'Divide by 0', 'Overflow')
+
+# 표시 가능한 최대 크기 (기존 float 계산과 같이 이보다 크면 Overflow)
+MAX_VALUE = Fraction(sys.float_info.max)
+
+# 화면 기호 → 내부 연산자
+OPERATOR_SYMBOLS = {'+': '+', '-': '-', '×': '*', '÷': '/', '*': '*', '/': '/'}
+DISPLAY_SYMBOLS = {'+': '+', '-': '-', '*': '×', '/': '÷'}
+
+
+class CalculatorError(Exception):
+    def __init__(self, message='Error'):
+        super().__init__(message)
+        self.message = message
+
+
+# 결과 포맷 (소수점 6자리 반올림, 불필요한 0 제거). 정수 연산만 써서 자릿수가 많아도 정확하게 표시
+def format_number(value):
+    scaled = round(Fraction(value) * 10 ** 6)
+    whole, fraction = divmod(abs(scaled), 10 ** 6)
+    text = f'{whole}.{fraction:06d}'.rstrip('0').rstrip('.')
+    return '-' + text if scaled < 0 else text
+
+
+# 수식 문자열 → 토큰 리스트 (숫자는 Fraction으로 변환)
+def tokenize(expression):
+    tokens = []
+    i, n = 0, len(expression)
+    while i < n:
+        ch = expression[i]
+        if ch.isspace():
+            i += 1
+        elif ch.isdigit() or ch == '.':
+            j = i
+            while j < n and (expression[j].isdigit() or expression[j] == '.'):
+                j += 1
+            try:
+                tokens.append(Fraction(Decimal(expression[i:j])))
+            except Exception:
+                raise CalculatorError()
+            i = j
+        elif ch in OPERATOR_SYMBOLS:
+            tokens.append(OPERATOR_SYMBOLS[ch])
+            i += 1
+        elif ch in '()%':
+            tokens.append(ch)
+            i += 1
+        else:
+            raise CalculatorError()
+    return tokens
+
+
+# 연산자 우선순위를 반영해 AST로 변환
+#   expr    := term (('+' | '-') term)*
+#   term    := unary (('*' | '/') unary)*
+#   unary   := ('+' | '-') unary | postfix
+#   postfix := primary '%'*
+#   primary := 숫자 | '(' expr ')'
+# 노드: ('num', 값) / ('neg', 노드) / ('pct', 노드) / (연산자, 왼쪽, 오른쪽)
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.expr()
+        if self.pos != len(self.tokens):
+            raise CalculatorError()
+        return node
+
+    def expr(self):
+        node = self.term()
+        while self.peek() in ('+', '-'):
+            op = self.take()
+            node = (op, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() in ('*', '/'):
+            op = self.take()
+            node = (op, node, self.unary())
+        return node
+
+    def unary(self):
+        # 연속된 부호는 재귀 대신 개수만 세서 처리
+        negative = False
+        while self.peek() in ('+', '-'):
+            if self.take() == '-':
+                negative = not negative
+        node = self.postfix()
+        return ('neg', node) if negative else node
+
+    def postfix(self):
+        node = self.primary()
+        while self.peek() == '%':
+            self.take()
+            node = ('pct', node)
+        return node
+
+    def primary(self):
+        token = self.take()
+        if isinstance(token, Fraction):
+            return ('num', token)
+        if token == '(':
+            node = self.expr()
+            if self.take() != ')':
+                raise CalculatorError()
+            return node
+        raise CalculatorError()
+
+
+def parse(expression):
+    return _Parser(tokenize(expression)).parse()
+
+
+# AST를 정확한 분수 연산으로 계산 (긴 수식에서도 재귀 한도에 걸리지 않도록 스택 사용)
+def evaluate(node):
+    stack = [(node, False)]
+    values = []
+    while stack:
+        node, visited = stack.pop()
+        kind = node[0]
+        if kind == 'num':
+            values.append(node[1])
+        elif not visited:
+            stack.append((node, True))
+            for child in reversed(node[1:]):
+                stack.append((child, False))
+        elif kind == 'neg':
+            values.append(-values.pop())
+        elif kind == 'pct':
+            values.append(values.pop() / 100)
+        else:
+            b = values.pop()
+            a = values.pop()
+            if kind == '+':
+                r = a + b
+            elif kind == '-':
+                r = a - b
+            elif kind == '*':
+                r = a * b
+            else:
+                if b == 0:
+                    raise CalculatorError('Divide by 0')
+                r = a / b
+            if abs(r) > MAX_VALUE:
+                raise CalculatorError('Overflow')
+            values.append(r)
+    return values[0]
+
+
+# 수식 하나를 계산해 화면 표시용 문자열(또는 오류 메시지)로 반환
+@lru_cache(maxsize=4096)
+def calculate(expression):
+    try:
+        return format_number(evaluate(parse(expression)))
+    except CalculatorError as e:
+        return e.message
+    except RecursionError:
+        return 'Error'
+
+
+# 여러 수식을 한 번에 계산 (같은 수식은 캐시 재사용)
+def evaluate_many(expressions):
+    return [calculate(expression) for expression in expressions]
+
+
+# 계산 로직 클래스: 숫자 입력, 연산자 처리, 결과 계산 담당
+# 입력된 수식은 토큰으로 쌓아 두었다가 = 를 누를 때 우선순위에 맞게 한 번에 계산
+class CalculatorCore:
+    def __init__(self):
+        self.reset()
+
+    # 상태 초기화
+    def reset(self):
+        self._current = '0'
+        self._tokens = []
+        self._awaiting_operand = False
+        self._just_evaluated = False
+
+    # 숫자 입력 처리
+    def input_digit(self, d):
+        if self._just_evaluated or self._current in ERRORS:
+            self.reset()
+            self._current = d
+        elif self._current == '0' or self._awaiting_operand:
+            self._current = d
+        else:
+            self._current += d
+        self._awaiting_operand = False
+
+    # 소수점 입력 처리
+    def input_decimal(self):
+        if self._just_evaluated or self._current in ERRORS:
+            self.reset()
+            self._current = '0.'
+        elif self._awaiting_operand:
+            self._current = '0.'
+        elif '.' not in self._current:
+            self._current += '.'
+        self._awaiting_operand = False
+
+    # 부호 반전
+    def negative_positive(self):
+        if self._current in ERRORS:
+            return
+        if self._current.startswith('-'):
+            self._current = self._current[1:]
+        elif self._current != '0':
+            self._current = '-' + self._current
+
+    # 퍼센트 처리
+    def percent(self):
+        if self._current in ERRORS:
+            return
+        try:
+            self._current = format_number(Fraction(Decimal(self._current)) / 100)
+        except Exception:
+            self._current = 'Error'
+
+    # 연산자 설정 (연산자를 연달아 누르면 마지막 연산자로 교체)
+    def set_operator(self, op):
+        if self._current in ERRORS:
+            return
+        op = OPERATOR_SYMBOLS[op]
+        self._just_evaluated = False
+        if self._awaiting_operand and self._tokens:
+            self._tokens[-1] = op
+        else:
+            self._tokens += [self._current, op]
+        self._current = '0'
+        self._awaiting_operand = True
+
+    # = 버튼 처리
+    def equal(self):
+        if not self._tokens:
+            return
+        self._current = calculate(self.expression() + self._current)
+        self._tokens = []
+        self._awaiting_operand = False
+        self._just_evaluated = True
+
+    # 지금까지 확정된 수식 (계산기 기호 사용)
+    def expression(self):
+        return ''.join(DISPLAY_SYMBOLS.get(token, token) for token in self._tokens)
+
+    # 출력할 문자열 반환
+    def display(self):
+        return self.expression() + self._current
+
+    # 버튼 텍스트 하나를 입력 (UI와 녹화된 입력 재생에서 공통 사용)
+    def press(self, key):
+        if key.isdigit():
+            self.input_digit(key)
+        elif key == '.':
+            self.input_decimal()
+        elif key in OPERATOR_SYMBOLS:
+            self.set_operator(key)
+        elif key == '=':
+            self.equal()
+        elif key == 'AC':
+            self.reset()
+        elif key == '+/-':
+            self.negative_positive()
+        elif key == '%':
+            self.percent()
+        else:
+            raise ValueError(f'알 수 없는 키: {key}')
+
+
+# 녹화된 키 입력 시퀀스를 QApplication 없이 재생하고 최종 화면 문자열을 반환
+def replay(keys):
+    core = CalculatorCore()
+    for key in keys:
+        core.press(key)
+    return core.display()
+
+
+def replay_many(sessions):
+    return [replay(keys) for keys in sessions]
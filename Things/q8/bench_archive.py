@@ -0,0 +1,77 @@
+import io
+import sys
+import time
+import math
+import wave
+import array
+import random
+import zipfile
+import argparse
+import javis
+
+
+# 벤치마크용 합성 녹음: 말소리 비슷한 배음 + 잡음, 중간중간 무음
+def synthetic_wav(seconds, rate=44100, seed=0):
+    rng = random.Random(seed)
+    samples = array.array('h')
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        if int(t * 2) % 3 == 2:
+            value = rng.randint(-20, 20)
+        else:
+            value = 6000 * math.sin(2 * math.pi * 220 * t) + 2500 * math.sin(2 * math.pi * 440 * t) + rng.randint(-300, 300)
+        samples.append(int(value))
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+# 압축 방식 하나에 대해 (압축 크기, 인코딩 시간, 디코딩 시간) 측정 (zip 압축/해제 포함)
+def measure(wav_bytes, codec):
+    start = time.perf_counter()
+    payload, meta, compress_type = javis.encode_recording(io.BytesIO(wav_bytes), codec)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr(zipfile.ZipInfo('sample.pcm'), payload, compress_type=compress_type)
+        size = zf.getinfo('sample.pcm').compress_size
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with zipfile.ZipFile(buffer) as zf:
+        restored = javis.decode_recording(zf.read('sample.pcm'), meta)
+    decode_time = time.perf_counter() - start
+
+    with wave.open(io.BytesIO(wav_bytes)) as original, wave.open(restored) as copy:
+        assert original.readframes(original.getnframes()) == copy.readframes(copy.getnframes()), codec
+    return size, encode_time, decode_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='녹음 보관 압축 방식별 크기/속도 비교')
+    parser.add_argument('files', nargs='*', help='비교할 WAV 파일 (없으면 합성 녹음 사용)')
+    parser.add_argument('--seconds', type=float, default=60, help='합성 녹음 길이 (초)')
+    args = parser.parse_args()
+
+    if args.files:
+        samples = [(path, open(path, 'rb').read()) for path in args.files]
+    else:
+        samples = [(f'synthetic {args.seconds:g}s', synthetic_wav(args.seconds))]
+
+    for name, wav_bytes in samples:
+        with wave.open(io.BytesIO(wav_bytes)) as wf:
+            duration = wf.getnframes() / float(wf.getframerate())
+        print(f'\n{name}: {len(wav_bytes) / 1024:.0f} KB, {duration:.1f}초')
+        print(f'{"codec":<15} {"size(KB)":>10} {"ratio":>8} {"MB/min":>8} {"encode(s)":>10} {"decode(s)":>10}')
+        for codec in javis.ARCHIVE_CODECS:
+            size, encode_time, decode_time = measure(wav_bytes, codec)
+            per_minute = size / 1024 / 1024 / (duration / 60) if duration else 0
+            print(f'{codec:<15} {size / 1024:>10.0f} {size / len(wav_bytes):>8.1%} {per_minute:>8.2f} '
+                  f'{encode_time:>10.3f} {decode_time:>10.3f}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,50 +1,126 @@
+import time
+_STARTUP_BEGIN = time.perf_counter()
+
 import os
 import sys
-import subprocess
-import importlib
+import importlib.util
 import datetime
 import wave
 import csv
+import struct
+import threading
+import json
+import hashlib
+import array
+import math
+import re
+import sqlite3
+import io
+import zipfile
+from itertools import accumulate
+from collections import deque
 
-def install_required_libraries():
-    """필수 라이브러리(pyaudio, speech_recognition, pydub) 설치 확인 및 자동 설치"""
-    def install_package(package):
-        try:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
-            print(f'{package} 설치 완료')
-        except subprocess.CalledProcessError:
-            print(f'{package} 설치 실패. 수동 설치가 필요합니다.')
-            sys.exit(1)
-
-    required_packages = {
-        'pyaudio': 'pyaudio',
-        'speech_recognition': 'SpeechRecognition',
-        'pydub': 'pydub'
-    }
-
-    for module_name, pip_name in required_packages.items():
-        try:
-            importlib.import_module(module_name)
-        except ImportError:
-            print(f'{pip_name}가 설치되어 있지 않습니다. 설치를 시작합니다...')
-            install_package(pip_name)
+# STT 설정: 동시 변환 개수, 인식 백엔드 (google 또는 오프라인 벤치마크용 mock)
+STT_WORKERS = 4
+STT_BACKEND = os.environ.get('JAVIS_STT_BACKEND', 'google')
+TRANSCRIPT_CACHE = '.transcript_cache.json'
+
+# 구간 분할 설정: 분석 창 길이, 무음으로 볼 RMS 기준, 구간을 끊을 무음 길이, 최대 구간 길이(초)
+SEGMENT_WINDOW = 0.05
+SILENCE_RMS = 500
+MIN_SILENCE = 0.5
+MAX_SEGMENT = 30.0
+SEGMENT_WORKERS = 4
+
+# 검색용 역색인 DB (transcribe_audio_to_csv가 CSV를 쓸 때마다 갱신)
+TRANSCRIPT_INDEX = 'records_transcripts.db'
+_index_lock = threading.Lock()
+
+# 날짜 조회용 녹음 목록 DB (records 폴더 변경 시각, 보관 zip 상태와 함께 보관)
+CATALOG_DB = 'records_catalog.db'
+
+# 오래된 녹음 압축 보관: 월별 zip (records/archive/YYYYMM.zip), 보관 기준 일수, 압축 방식
+ARCHIVE_DIR = os.path.join('records', 'archive')
+ARCHIVE_DAYS = 30
+ARCHIVE_CODEC = 'delta+bzip2'
 
-    check_ffmpeg_installed()
+# 메뉴 기능별로 필요한 패키지 (모듈 이름: pip 이름) — 해당 기능을 처음 쓸 때만 확인
+REQUIREMENTS = {
+    'record': {'pyaudio': 'pyaudio'},
+    'transcribe': {'speech_recognition': 'SpeechRecognition'},
+}
+STATE_FILE = '.javis_state.json'
 
-def check_ffmpeg_installed():
-    """시스템에 ffmpeg가 설치되어 있는지 확인한다 (pydub 사용 시 필요)"""
+# --profile-startup 으로 실행하면 단계별 소요 시간을 기록해서 출력
+PROFILE = {'enabled': False, 'stages': []}
+
+def profile_stage(name, started):
+    elapsed = time.perf_counter() - started
+    PROFILE['stages'].append((name, elapsed))
+    if PROFILE['enabled']:
+        print(f'[profile] {name}: {elapsed * 1000:.1f} ms')
+
+def load_state():
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_state(state):
     try:
-        subprocess.check_output(['ffmpeg', '-version'])
-        print('ffmpeg 설치 확인 완료')
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print('ffmpeg가 시스템에 설치되어 있지 않습니다.')
-        print('pydub를 사용하려면 ffmpeg를 설치해야 합니다.')
-        print('설치 방법 예시:')
-        print(' - Windows: https://ffmpeg.org/download.html')
-        print(' - Mac: brew install ffmpeg')
-        print(' - Ubuntu: sudo apt install ffmpeg')
+        with open(STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+    except OSError as e:
+        print('상태 파일 저장 실패:', e)
+
+def install_package(package):
+    import subprocess
+    try:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
+        print(f'{package} 설치 완료')
+    except subprocess.CalledProcessError:
+        print(f'{package} 설치 실패. 수동 설치가 필요합니다.')
         sys.exit(1)
 
+def ensure_capability(name):
+    """기능에 필요한 패키지가 있는지 확인하고 없으면 설치 (import 없이 find_spec으로만 확인)
+
+    확인 결과는 인터프리터 경로와 함께 상태 파일에 저장해서 다음 실행부터는 다시 확인하지 않는다.
+    """
+    started = time.perf_counter()
+    state = load_state()
+    probed = state.setdefault(sys.executable, {})
+    changed = False
+    for module_name, pip_name in REQUIREMENTS[name].items():
+        if probed.get(module_name):
+            continue
+        if importlib.util.find_spec(module_name) is None:
+            print(f'{pip_name}가 설치되어 있지 않습니다. 설치를 시작합니다...')
+            install_package(pip_name)
+            importlib.invalidate_caches()
+        probed[module_name] = True
+        changed = True
+    if changed:
+        save_state(state)
+    profile_stage(f'capability check ({name})', started)
+
+def import_capability(name, module_name):
+    """ensure_capability 후 모듈을 import. 상태 파일에는 있다고 되어 있지만 그 사이 패키지가 지워졌다면
+    저장된 확인 결과를 버리고 다시 확인(필요하면 설치)한 뒤 import"""
+    ensure_capability(name)
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        state = load_state()
+        probed = state.get(sys.executable, {})
+        for cached in REQUIREMENTS[name]:
+            probed.pop(cached, None)
+        save_state(state)
+        importlib.invalidate_caches()
+        ensure_capability(name)
+        return importlib.import_module(module_name)
+
 def get_current_timestamp():
     now = datetime.datetime.now()
     return now.strftime('%Y%m%d-%H%M%S')
@@ -53,39 +129,231 @@ def create_records_directory():
     if not os.path.exists('records'):
         os.makedirs('records')
 
+class RingBuffer:
+    """미리 할당한 고정 크기 슬롯을 돌려 쓰는 링 버퍼 (생산자 1개, 소비자 1개)"""
+    def __init__(self, slots, slot_size):
+        self.slots = slots
+        self.slot_size = slot_size
+        self._buffer = bytearray(slots * slot_size)
+        self._view = memoryview(self._buffer)
+        self._lengths = [0] * slots
+        self._free = threading.Semaphore(slots)
+        self._filled = threading.Semaphore(0)
+        self._head = 0
+        self._tail = 0
+
+    def put(self, data):
+        """빈 슬롯이 생길 때까지 기다렸다가 데이터를 복사"""
+        self._free.acquire()
+        offset = self._head * self.slot_size
+        self._view[offset:offset + len(data)] = data
+        self._lengths[self._head] = len(data)
+        self._head = (self._head + 1) % self.slots
+        self._filled.release()
+
+    def drain(self, write, timeout=None):
+        """채워진 슬롯 하나를 write에 넘기고 슬롯을 비움. 제한 시간 안에 데이터가 없으면 False"""
+        if not self._filled.acquire(timeout=timeout):
+            return False
+        offset = self._tail * self.slot_size
+        write(self._view[offset:offset + self._lengths[self._tail]])
+        self._tail = (self._tail + 1) % self.slots
+        self._free.release()
+        return True
+
+
+class StreamingWavWriter:
+    """백그라운드 스레드에서 WAV 프레임을 바로 디스크에 쓰고, 주기적으로/종료 시 헤더 크기를 갱신"""
+    HEADER_SIZE = 44
+
+    def __init__(self, filename, channels, sample_width, rate, chunk_size, slots=64, patch_every=43):
+        self.channels = channels
+        self.sample_width = sample_width
+        self.rate = rate
+        self.patch_every = patch_every  # 이 개수의 청크마다 헤더 갱신 (기본 약 1초)
+        self.data_size = 0
+        self._error = None  # 쓰기 스레드에서 난 오류 (write/close에서 다시 발생시킴)
+        self._file = open(filename, 'wb')
+        self._file.write(self._header())
+        self._ring = RingBuffer(slots, chunk_size * channels * sample_width)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _header(self):
+        return struct.pack('<4sI4s4sIHHIIHH4sI',
+                           b'RIFF', 36 + self.data_size, b'WAVE',
+                           b'fmt ', 16, 1, self.channels, self.rate,
+                           self.rate * self.channels * self.sample_width,
+                           self.channels * self.sample_width, self.sample_width * 8,
+                           b'data', self.data_size)
+
+    def _write(self, frames):
+        if self._error is not None:
+            return  # 오류 뒤에는 버려서 슬롯을 비움 (put이 영원히 기다리지 않도록)
+        try:
+            self._file.write(frames)
+            self.data_size += len(frames)
+        except Exception as e:
+            self._error = e
+
+    def _patch_header(self):
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.seek(position)
+        self._file.flush()
+
+    def _run(self):
+        written = 0
+        while True:
+            if self._ring.drain(self._write, timeout=0.1):
+                written += 1
+                if self._error is None and written % self.patch_every == 0:
+                    try:
+                        self._patch_header()
+                    except Exception as e:
+                        self._error = e
+            elif self._stopped.is_set():
+                break
+
+    def write(self, frames):
+        if self._error is not None:
+            raise self._error
+        self._ring.put(frames)
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join()
+        try:
+            if self._error is not None:
+                raise self._error
+            self._patch_header()
+        finally:
+            self._file.close()
+
+
 def record_voice(seconds=5):
-    import pyaudio
+    """seconds 동안 녹음 (0 이하 또는 None이면 Ctrl+C를 누를 때까지 계속 녹음)"""
+    started = time.perf_counter()
+    pyaudio = import_capability('record', 'pyaudio')
+    profile_stage('import pyaudio', started)
     chunk = 1024
     format = pyaudio.paInt16
     channels = 1
     rate = 44100
     filename = 'records/' + get_current_timestamp() + '.wav'
+    records_mtime = os.path.getmtime('records')
 
     audio = pyaudio.PyAudio()
-    print('녹음을 시작합니다...')
+    print('녹음을 시작합니다...' if seconds and seconds > 0 else '녹음을 시작합니다... (Ctrl+C로 종료)')
 
     stream = audio.open(format=format,
                         channels=channels,
                         rate=rate,
                         input=True,
                         frames_per_buffer=chunk)
+    writer = StreamingWavWriter(filename, channels, audio.get_sample_size(format), rate, chunk)
 
-    frames = []
-    for _ in range(0, int(rate / chunk * seconds)):
-        data = stream.read(chunk)
-        frames.append(data)
+    try:
+        remaining = int(rate / chunk * seconds) if seconds and seconds > 0 else None
+        while remaining is None or remaining > 0:
+            writer.write(stream.read(chunk))
+            if remaining is not None:
+                remaining -= 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream.stop_stream()
+        stream.close()
+        audio.terminate()
+        writer.close()
 
+    catalog_add(os.path.basename(filename), records_mtime)
     print('녹음이 완료되었습니다:', filename)
 
-    stream.stop_stream()
-    stream.close()
-    audio.terminate()
+def _open_catalog():
+    conn = sqlite3.connect(CATALOG_DB)
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS recordings (stamp TEXT PRIMARY KEY, file TEXT);
+        CREATE TABLE IF NOT EXISTS archived (stamp TEXT PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+    ''')
+    return conn
+
+def _catalog_meta(conn, key):
+    row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else None
+
+def _archive_state():
+    """보관 zip들의 (이름, 크기, 수정 시각) — zip을 열지 않고 stat만으로 바뀌었는지 확인"""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return '[]'
+    state = []
+    for name in sorted(os.listdir(ARCHIVE_DIR)):
+        if name.endswith('.zip'):
+            st = os.stat(os.path.join(ARCHIVE_DIR, name))
+            state.append([name, st.st_size, st.st_mtime_ns])
+    return json.dumps(state)
+
+def sync_catalog(conn):
+    """records 폴더가 바뀌었으면 그 목록만 다시 읽고, 보관 zip은 zip이 바뀌었을 때만 다시 읽음"""
+    records_mtime = os.path.getmtime('records')
+    if _catalog_meta(conn, 'records_mtime') != records_mtime:
+        with conn:
+            conn.execute('DELETE FROM recordings')
+            conn.executemany('INSERT OR REPLACE INTO recordings VALUES (?, ?)',
+                             [(os.path.splitext(f)[0], f) for f in os.listdir('records') if f.endswith('.wav')])
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('records_mtime', ?)", (records_mtime,))
+    archive_state = _archive_state()
+    if _catalog_meta(conn, 'archive_state') != archive_state:
+        with conn:
+            conn.execute('DELETE FROM archived')
+            conn.executemany('INSERT OR REPLACE INTO archived VALUES (?)',
+                             [(stamp,) for stamp in list_archived_stamps()])
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('archive_state', ?)", (archive_state,))
+
+def catalog_add(filename, previous_mtime):
+    """record_voice가 새 파일을 만든 뒤 호출. 그 사이 다른 변경이 없었다면 한 줄만 추가"""
+    try:
+        conn = _open_catalog()
+        try:
+            if _catalog_meta(conn, 'records_mtime') != previous_mtime:
+                return  # 다음 조회 때 sync_catalog가 폴더를 다시 읽음
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO recordings VALUES (?, ?)', (os.path.splitext(filename)[0], filename))
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('records_mtime', ?)", (os.path.getmtime('records'),))
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print('녹음 목록 갱신 실패:', e)
+
+def _list_records_from_directory(start_date, end_date):
+    """catalog를 쓸 수 없을 때의 기존 방식: 폴더 전체를 훑으며 파일명 날짜 비교"""
+    files = []
+    for filename in sorted(os.listdir('records')):
+        if filename.endswith('.wav'):
+            try:
+                file_date_str = filename.split('-')[0]
+                file_date = datetime.datetime.strptime(file_date_str, '%Y%m%d')
+                if start_date <= file_date <= end_date:
+                    files.append(filename)
+            except Exception:
+                continue
+    return files
 
-    with wave.open(filename, 'wb') as wf:
-        wf.setnchannels(channels)
-        wf.setsampwidth(audio.get_sample_size(format))
-        wf.setframerate(rate)
-        wf.writeframes(b''.join(frames))
+def _list_records_from_catalog(start_date, end_date):
+    """타임스탬프 기본 키로 범위 조회 (YYYYMMDD-HHMMSS는 문자열 순서 = 시간 순서)"""
+    conn = _open_catalog()
+    try:
+        sync_catalog(conn)
+        bounds = (start_date.strftime('%Y%m%d'), (end_date + datetime.timedelta(days=1)).strftime('%Y%m%d'))
+        rows = conn.execute('''SELECT stamp, file FROM recordings WHERE stamp >= ? AND stamp < ?
+                                UNION SELECT stamp, stamp || '.wav' FROM archived WHERE stamp >= ? AND stamp < ?
+                                ORDER BY stamp''', bounds + bounds)
+        return [row[1] for row in rows]
+    finally:
+        conn.close()
 
 def list_records_by_date_range(start_date_str, end_date_str):
     try:
@@ -100,80 +368,461 @@ def list_records_by_date_range(start_date_str, end_date_str):
         return
 
     print(f'{start_date_str} ~ {end_date_str} 사이의 녹음 파일 목록:')
-    found = False
-    for filename in sorted(os.listdir('records')):
-        if filename.endswith('.wav'):
-            try:
-                file_date_str = filename.split('-')[0]
-                file_date = datetime.datetime.strptime(file_date_str, '%Y%m%d')
-                if start_date <= file_date <= end_date:
-                    print('-', filename)
-                    found = True
-            except Exception:
-                continue
-    if not found:
+    try:
+        files = _list_records_from_catalog(start_date, end_date)
+    except sqlite3.Error:
+        files = _list_records_from_directory(start_date, end_date)
+    for filename in files:
+        print('-', filename)
+    if not files:
         print('해당 날짜 범위에 녹음 파일이 없습니다.')
 
-def transcribe_audio_to_csv(filename):
+# 압축 방식: (샘플 차분 여부, zip 압축 방식)
+# 16비트 PCM은 그대로 압축하면 잘 줄지 않으므로, 이전 샘플과의 차이만 저장해서(FLAC 예측기와 같은 원리) 압축률을 높인다.
+ARCHIVE_CODECS = {
+    'stored': (False, zipfile.ZIP_STORED),
+    'deflate': (False, zipfile.ZIP_DEFLATED),
+    'lzma': (False, zipfile.ZIP_LZMA),
+    'delta+deflate': (True, zipfile.ZIP_DEFLATED),
+    'delta+bzip2': (True, zipfile.ZIP_BZIP2),
+    'delta+lzma': (True, zipfile.ZIP_LZMA),
+}
+
+def _wrap16(value):
+    return ((value + 32768) & 0xFFFF) - 32768
+
+def delta_encode(frames, channels):
+    """16비트 PCM을 채널별 이전 샘플과의 차이로 변환"""
+    samples = array.array('h', frames)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    diffs = samples[:channels] + array.array('h', (_wrap16(b - a) for a, b in zip(samples, samples[channels:])))
+    if sys.byteorder == 'big':
+        diffs.byteswap()
+    return diffs.tobytes()
+
+def delta_decode(data, channels):
+    diffs = array.array('h', data)
+    if sys.byteorder == 'big':
+        diffs.byteswap()
+    samples = array.array('h', bytes(len(data)))
+    for c in range(channels):
+        samples[c::channels] = array.array('h', (_wrap16(v) for v in accumulate(diffs[c::channels])))
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples.tobytes()
+
+def encode_recording(source, codec=ARCHIVE_CODEC):
+    """WAV(경로 또는 파일 객체)를 (보관용 데이터, 메타데이터, zip 압축 방식)으로 변환"""
+    use_delta, compress_type = ARCHIVE_CODECS[codec]
+    with wave.open(source, 'rb') as wf:
+        params = wf.getparams()
+        frames = wf.readframes(params.nframes)
+    use_delta = use_delta and params.sampwidth == 2
+    if use_delta:
+        frames = delta_encode(frames, params.nchannels)
+    meta = {'channels': params.nchannels, 'sampwidth': params.sampwidth,
+            'rate': params.framerate, 'delta': use_delta}
+    return frames, meta, compress_type
+
+def decode_recording(payload, meta):
+    """보관용 데이터를 WAV 파일 객체(BytesIO)로 복원"""
+    frames = delta_decode(payload, meta['channels']) if meta['delta'] else payload
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(meta['channels'])
+        wf.setsampwidth(meta['sampwidth'])
+        wf.setframerate(meta['rate'])
+        wf.writeframes(frames)
+    buffer.seek(0)
+    return buffer
+
+def _archive_path(stamp):
+    return os.path.join(ARCHIVE_DIR, stamp[:6] + '.zip')
+
+def list_archived_stamps():
+    """모든 월별 보관 파일의 중앙 디렉터리(색인)만 읽어서 보관된 녹음 타임스탬프 목록 반환"""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    stamps = []
+    for name in sorted(os.listdir(ARCHIVE_DIR)):
+        if name.endswith('.zip'):
+            with zipfile.ZipFile(os.path.join(ARCHIVE_DIR, name)) as zf:
+                stamps += [os.path.splitext(member)[0] for member in zf.namelist()]
+    return stamps
+
+def open_recording(filename):
+    """records 폴더에 있으면 그 파일을, 보관된 녹음이면 zip에서 해당 항목만 풀어 파일 객체로 반환"""
+    path = os.path.join('records', filename)
+    if os.path.exists(path):
+        return open(path, 'rb')
+    stamp = os.path.splitext(filename)[0]
+    archive = _archive_path(stamp)
+    if not os.path.exists(archive):
+        raise FileNotFoundError(path)
+    with zipfile.ZipFile(archive) as zf:
+        info = zf.getinfo(stamp + '.pcm')
+        return decode_recording(zf.read(info), json.loads(info.comment))
+
+def archive_old_records(days=ARCHIVE_DAYS, codec=ARCHIVE_CODEC):
+    """days일보다 오래된 녹음을 월별 zip으로 옮김 (메타데이터는 zip 항목 주석에 저장, CSV는 그대로 둠)"""
+    if not os.path.exists('records'):
+        print('records 폴더가 존재하지 않습니다.')
+        return
+    cutoff = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime('%Y%m%d')
+    targets = sorted(f for f in os.listdir('records') if f.endswith('.wav') and f[:8] < cutoff)
+    if not targets:
+        print('보관할 녹음 파일이 없습니다.')
+        return
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    before = after = 0
+    for filename in targets:
+        path = os.path.join('records', filename)
+        stamp = os.path.splitext(filename)[0]
+        try:
+            payload, meta, compress_type = encode_recording(path, codec)
+            with zipfile.ZipFile(_archive_path(stamp), 'a') as zf:
+                if stamp + '.pcm' in zf.namelist():
+                    print('이미 보관된 녹음입니다:', filename)
+                    continue
+                info = zipfile.ZipInfo(stamp + '.pcm', date_time=time.localtime(os.path.getmtime(path))[:6])
+                info.compress_type = compress_type
+                info.comment = json.dumps(meta).encode()
+                zf.writestr(info, payload)
+                after += zf.getinfo(stamp + '.pcm').compress_size
+            before += os.path.getsize(path)
+            os.remove(path)
+        except (OSError, wave.Error, zipfile.BadZipFile) as e:
+            print('보관 실패:', filename, e)
+    if before:
+        print(f'{len(targets)}개 파일 보관 완료: {before / 1024:.0f} KB → {after / 1024:.0f} KB ({after / before:.1%})')
+
+class UnrecognizedSpeech(Exception):
+    """인식 백엔드가 음성을 이해하지 못했을 때"""
+
+def recognize_google(frames, params):
     import speech_recognition as sr
-    from pydub import AudioSegment
+    recognizer = sr.Recognizer()
+    try:
+        audio_data = sr.AudioData(frames, params.framerate, params.sampwidth)
+        return recognizer.recognize_google(audio_data, language='ko-KR')
+    except sr.UnknownValueError:
+        raise UnrecognizedSpeech()
+
+def recognize_mock(frames, params):
+    """네트워크 없이 파이프라인을 측정하기 위한 가짜 인식기 (길이의 5%만큼 대기)"""
+    duration = len(frames) / float(params.framerate * params.sampwidth * params.nchannels)
+    time.sleep(duration * 0.05)
+    return '모의 변환 결과 {:.1f}초'.format(duration)
+
+RECOGNIZERS = {
+    'google': recognize_google,
+    'mock': recognize_mock,
+}
+
+def _rms(fragment, sample_width):
+    try:
+        import audioop  # Python 3.13부터 제거됨
+        return audioop.rms(fragment, sample_width)
+    except ImportError:
+        if sample_width != 2:
+            return SILENCE_RMS + 1  # 16비트가 아니면 분석하지 않고 음성으로 취급
+        samples = array.array('h', fragment)
+        return math.sqrt(sum(x * x for x in samples) / len(samples)) if samples else 0
+
+def iter_segments(source, min_silence=MIN_SILENCE, max_segment=MAX_SEGMENT, window=SEGMENT_WINDOW):
+    """WAV(경로 또는 파일 객체)를 창 단위로 읽으면서 (시작초, 끝초, 프레임) 구간을 하나씩 생성
+
+    min_silence 이상 무음이 이어지면 구간을 끊고, 구간이 max_segment를 넘으면 강제로 끊는다.
+    min_silence가 None이면 무음 검사 없이 max_segment 길이의 고정 창으로 나눈다.
+    파일 전체가 아니라 현재 구간만 메모리에 둔다.
+    """
+    with wave.open(source, 'rb') as wf:
+        params = wf.getparams()
+        rate = params.framerate
+        window_frames = max(1, int(rate * window))
+        silence_limit = None if min_silence is None else max(1, int(min_silence / window))
+        max_windows = max(1, int(max_segment / window))
 
+        pieces, start, silent_run, position = [], None, 0, 0
+        while True:
+            fragment = wf.readframes(window_frames)
+            if not fragment:
+                break
+            count = len(fragment) // (params.sampwidth * params.nchannels)
+            silent = silence_limit is not None and _rms(fragment, params.sampwidth) < SILENCE_RMS
+            if start is None:
+                if not silent:
+                    start, pieces, silent_run = position, [fragment], 0
+            else:
+                pieces.append(fragment)
+                silent_run = silent_run + 1 if silent else 0
+                if (silence_limit is not None and silent_run >= silence_limit) or len(pieces) >= max_windows:
+                    # 끝의 무음 창은 잘라내고 내보냄
+                    voiced = pieces[:len(pieces) - silent_run] if silent_run < len(pieces) else pieces
+                    end = start + sum(len(p) for p in voiced) // (params.sampwidth * params.nchannels)
+                    yield start / rate, end / rate, b''.join(voiced), params
+                    start, pieces, silent_run = None, [], 0
+            position += count
+
+        if start is not None and pieces:
+            voiced = pieces[:len(pieces) - silent_run] if silent_run < len(pieces) else pieces
+            end = start + sum(len(p) for p in voiced) // (params.sampwidth * params.nchannels)
+            yield start / rate, end / rate, b''.join(voiced), params
+
+def _map_bounded(executor, fn, items, limit):
+    """items를 executor로 처리하되 동시에 limit개까지만 제출하고, 입력 순서대로 결과를 반환"""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def file_hash(filepath, chunk_size=1024 * 1024):
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_transcript_cache():
+    try:
+        with open(TRANSCRIPT_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_transcript_cache(cache):
+    tmp = TRANSCRIPT_CACHE + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, TRANSCRIPT_CACHE)
+
+def transcribe_audio_to_csv(filename, backend=None):
+    """녹음 파일 하나를 변환해 같은 이름의 CSV로 저장. 성공(빈 결과 포함) 시 True"""
+    recognize = RECOGNIZERS[backend or STT_BACKEND]
     filepath = os.path.join('records', filename)
     base = os.path.splitext(filepath)[0]
     csv_filename = base + '.csv'
 
-    recognizer = sr.Recognizer()
     print('STT 변환 중:', filename)
 
-    try:
-        with sr.AudioFile(filepath) as source:
-            audio_data = recognizer.record(source)
-            text = recognizer.recognize_google(audio_data, language='ko-KR')
+    from concurrent.futures import ThreadPoolExecutor
+
+    def transcribe_segment(segment):
+        seg_start, seg_end, frames, params = segment
+        try:
+            return ['{:.1f}~{:.1f}s'.format(seg_start, seg_end), recognize(frames, params)]
+        except UnrecognizedSpeech:
+            return None
 
-        duration = AudioSegment.from_wav(filepath).duration_seconds
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
+    # 임시 파일에 쓰고 성공했을 때만 바꿔치기 (인식 오류로 기존 CSV를 지우지 않도록)
+    tmp_filename = csv_filename + '.tmp'
+    try:
+        # 구간별로 동시에 변환하되, 대기 중인 구간 수를 제한해 메모리를 일정하게 유지
+        with ThreadPoolExecutor(max_workers=SEGMENT_WORKERS) as executor, \
+                open_recording(filename) as source, \
+                open(tmp_filename, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(['Time', 'Text'])
-            writer.writerow(['0~{:.1f}s'.format(duration), text])
+            written = 0
+            for row in _map_bounded(executor, transcribe_segment, iter_segments(source), SEGMENT_WORKERS * 2):
+                if row is not None:
+                    writer.writerow(row)
+                    written += 1
+            if not written:
+                print('음성을 이해할 수 없습니다:', filename)
+                writer.writerow(['-', ''])  # 빈 텍스트 저장
+        os.replace(tmp_filename, csv_filename)
 
         print('CSV 저장 완료:', os.path.basename(csv_filename))
-
-    except sr.UnknownValueError:
-        print('음성을 이해할 수 없습니다:', filename)
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Time', 'Text'])
-            writer.writerow(['-', ''])  # 빈 텍스트 저장
-        print('빈 CSV 저장 완료:', os.path.basename(csv_filename))
+        index_transcript(os.path.basename(csv_filename))
+        return True
 
     except Exception as e:
-        print('오류 발생:', str(e))
+        print('오류 발생:', filename, str(e))
+        try:
+            os.remove(tmp_filename)
+        except OSError:
+            pass
+        return False
 
-def transcribe_all_wav_files():
+def transcribe_all_wav_files(backend=None, workers=STT_WORKERS):
+    """내용이 바뀌지 않은 파일은 건너뛰고, 나머지만 스레드 풀로 동시에 변환"""
     if not os.path.exists('records'):
         print('records 폴더가 존재하지 않습니다.')
         return
-    for f in os.listdir('records'):
-        if f.endswith('.wav'):
-            transcribe_audio_to_csv(f)
+
+    cache = load_transcript_cache()
+    pending = {}
+    for f in sorted(os.listdir('records')):
+        if not f.endswith('.wav'):
+            continue
+        digest = file_hash(os.path.join('records', f))
+        csv_path = os.path.join('records', os.path.splitext(f)[0] + '.csv')
+        if cache.get(f) == digest and os.path.exists(csv_path):
+            continue
+        pending[f] = digest
+
+    skipped = sum(1 for f in os.listdir('records') if f.endswith('.wav')) - len(pending)
+    if skipped:
+        print(f'변경되지 않은 파일 {skipped}개는 건너뜁니다.')
+    if not pending:
+        print('새로 변환할 파일이 없습니다.')
+        return
+
+    if (backend or STT_BACKEND) == 'google':
+        import_capability('transcribe', 'speech_recognition')  # 스레드에서 import하기 전에 확인
+    from concurrent.futures import ThreadPoolExecutor
+
+    start = time.perf_counter()
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda f: transcribe_audio_to_csv(f, backend), pending)
+        for f, ok in zip(pending, results):
+            if ok:
+                cache[f] = pending[f]
+            else:
+                failed.append(f)
+    save_transcript_cache(cache)
+    print(f'{len(pending) - len(failed)}개 파일 변환 완료 ({time.perf_counter() - start:.2f}초)')
+    if failed:
+        print(f'{len(failed)}개 파일 변환 실패 (다음 실행 때 다시 시도):', ', '.join(failed))
+
+def _bigrams(text):
+    """공백을 제외한 연속 두 글자 집합 (한국어처럼 띄어쓰기 없는 부분 문자열 검색용)"""
+    return {text[i:i + 2] for i in range(len(text) - 1) if not text[i:i + 2].isspace()}
+
+def _words(text):
+    return set(re.findall(r'\w+', text))
+
+def _open_index():
+    conn = sqlite3.connect(TRANSCRIPT_INDEX)
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS files (file TEXT PRIMARY KEY, mtime REAL);
+        CREATE TABLE IF NOT EXISTS segments (id INTEGER PRIMARY KEY, file TEXT, time TEXT, text TEXT);
+        CREATE TABLE IF NOT EXISTS grams (gram TEXT, segment_id INTEGER);
+        CREATE TABLE IF NOT EXISTS words (word TEXT, segment_id INTEGER);
+        CREATE INDEX IF NOT EXISTS idx_segments_file ON segments (file);
+        CREATE INDEX IF NOT EXISTS idx_grams ON grams (gram, segment_id);
+        CREATE INDEX IF NOT EXISTS idx_words ON words (word, segment_id);
+    ''')
+    return conn
+
+def _index_file(conn, filename):
+    """CSV 하나의 기존 색인을 지우고 다시 등록"""
+    path = os.path.join('records', filename)
+    old_ids = [row[0] for row in conn.execute('SELECT id FROM segments WHERE file = ?', (filename,))]
+    for segment_id in old_ids:
+        conn.execute('DELETE FROM grams WHERE segment_id = ?', (segment_id,))
+        conn.execute('DELETE FROM words WHERE segment_id = ?', (segment_id,))
+    conn.execute('DELETE FROM segments WHERE file = ?', (filename,))
+
+    with open(path, 'r', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 2 or not row[1]:
+                continue
+            cursor = conn.execute('INSERT INTO segments (file, time, text) VALUES (?, ?, ?)', (filename, row[0], row[1]))
+            segment_id = cursor.lastrowid
+            conn.executemany('INSERT INTO grams VALUES (?, ?)', [(g, segment_id) for g in _bigrams(row[1])])
+            conn.executemany('INSERT INTO words VALUES (?, ?)', [(w, segment_id) for w in _words(row[1])])
+    conn.execute('INSERT OR REPLACE INTO files VALUES (?, ?)', (filename, os.path.getmtime(path)))
+
+def index_transcript(filename):
+    """변환 직후 CSV 하나를 색인에 반영"""
+    with _index_lock:
+        conn = _open_index()
+        try:
+            with conn:
+                _index_file(conn, filename)
+        finally:
+            conn.close()
+
+def sync_transcript_index(conn):
+    """색인 밖에서 추가/수정/삭제된 CSV만 골라 반영 (파일 내용은 바뀐 것만 읽음)"""
+    indexed = dict(conn.execute('SELECT file, mtime FROM files'))
+    current = {f for f in os.listdir('records') if f.endswith('.csv')}
+    with conn:
+        for f in current:
+            if indexed.get(f) != os.path.getmtime(os.path.join('records', f)):
+                _index_file(conn, f)
+        for f in set(indexed) - current:
+            for (segment_id,) in conn.execute('SELECT id FROM segments WHERE file = ?', (f,)).fetchall():
+                conn.execute('DELETE FROM grams WHERE segment_id = ?', (segment_id,))
+                conn.execute('DELETE FROM words WHERE segment_id = ?', (segment_id,))
+            conn.execute('DELETE FROM segments WHERE file = ?', (f,))
+            conn.execute('DELETE FROM files WHERE file = ?', (f,))
+
+def _term_candidates(conn, term):
+    """검색어 하나에 해당할 수 있는 구간 id 집합 (None이면 색인으로 좁힐 수 없음)"""
+    if term.endswith('*'):
+        prefix = term[:-1]
+        rows = conn.execute('SELECT DISTINCT segment_id FROM words WHERE word >= ? AND word < ?',
+                            (prefix, prefix + '\U0010ffff'))
+        return {row[0] for row in rows}
+    grams = _bigrams(term)
+    if not grams:
+        return None
+    placeholders = ','.join('?' * len(grams))
+    rows = conn.execute(f'''SELECT segment_id FROM grams WHERE gram IN ({placeholders})
+                            GROUP BY segment_id HAVING COUNT(DISTINCT gram) = ?''', (*grams, len(grams)))
+    return {row[0] for row in rows}
+
+def _term_matches(term, text):
+    if term.endswith('*'):
+        return any(word.startswith(term[:-1]) for word in _words(text))
+    return term in text
 
 def search_keyword_in_transcripts(keyword):
+    """공백으로 구분한 모든 검색어를 포함하는 구간 출력 (단어* 는 접두어 검색)"""
+    terms = keyword.split()
+    if not terms or not os.path.exists('records'):
+        print('검색된 결과가 없습니다.')
+        return
+
+    with _index_lock:
+        conn = _open_index()
+        try:
+            sync_transcript_index(conn)
+            candidates = None
+            for term in terms:
+                ids = _term_candidates(conn, term)
+                if ids is not None:
+                    candidates = ids if candidates is None else candidates & ids
+            if candidates is None:
+                rows = conn.execute('SELECT id, file, time, text FROM segments ORDER BY file, id').fetchall()
+            else:
+                rows = []
+                ids = sorted(candidates)
+                for i in range(0, len(ids), 500):
+                    batch = ids[i:i + 500]
+                    rows += conn.execute(f'SELECT id, file, time, text FROM segments WHERE id IN ({",".join("?" * len(batch))})',
+                                         batch).fetchall()
+                rows.sort(key=lambda row: (row[1], row[0]))
+        finally:
+            conn.close()
+
     found = False
-    for f in os.listdir('records'):
-        if f.endswith('.csv'):
-            with open(os.path.join('records', f), 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                next(reader, None)
-                for row in reader:
-                    if keyword in row[1]:
-                        print('[{}] {}: {}'.format(f, row[0], row[1]))
-                        found = True
+    for _, f, time_range, text in rows:
+        # 색인은 후보만 좁히고, 최종 일치 여부는 원문으로 확인
+        if all(_term_matches(term, text) for term in terms):
+            print('[{}] {}: {}'.format(f, time_range, text))
+            found = True
     if not found:
         print('검색된 결과가 없습니다.')
 
 def main():
-    install_required_libraries()
+    PROFILE['enabled'] = '--profile-startup' in sys.argv[1:]
+    profile_stage('module imports', _STARTUP_BEGIN)
+    started = time.perf_counter()
     create_records_directory()
+    profile_stage('records directory', started)
+    profile_stage('startup total', _STARTUP_BEGIN)
 
     while True:
         print('\n메뉴:')
@@ -182,11 +831,12 @@ def main():
         print('3. STT 변환 및 CSV 저장')
         print('4. 키워드 검색 (보너스)')
         print('5. 종료')
-        choice = input('선택 (1~5): ')
+        print('6. 오래된 녹음 압축 보관')
+        choice = input('선택 (1~6): ')
 
         if choice == '1':
             try:
-                sec = int(input('녹음 시간 (초, 기본 5초): '))
+                sec = int(input('녹음 시간 (초, 기본 5초, 0은 Ctrl+C까지): '))
             except ValueError:
                 sec = 5
             record_voice(seconds=sec)
@@ -202,6 +852,12 @@ def main():
         elif choice == '5':
             print('프로그램을 종료합니다.')
             break
+        elif choice == '6':
+            try:
+                days = int(input(f'며칠 지난 녹음을 보관할까요? (기본 {ARCHIVE_DAYS}일): '))
+            except ValueError:
+                days = ARCHIVE_DAYS
+            archive_old_records(days)
         else:
             print('잘못된 선택입니다.')
 
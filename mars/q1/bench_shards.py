@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from multiprocessing import cpu_count
+import main
+
+# 합성 로그에 섞어 넣을 일반 메시지와 문제 메시지
+NORMAL_MESSAGES = [
+    'Power systems online. Batteries at optimal charge.',
+    'Communication established with mission control.',
+    'Telemetry packet received.',
+    'Navigation system recalibrated.',
+    'Thermal control nominal.',
+]
+CRITICAL_MESSAGES = [
+    'Oxygen tank unstable.',
+    'Oxygen tank explosion.',
+    'Center and mission control systems powered down.',
+]
+
+
+def make_synthetic_log(path, size_bytes, critical_ratio=0.001, seed=0):
+    """timestamp,event,message 형식의 합성 로그를 size_bytes 크기까지 생성"""
+    rng = random.Random(seed)
+    block = []
+    written = 0
+    second = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('timestamp,event,message\n')
+        while written < size_bytes:
+            second += 1
+            h, m, s = second // 3600 % 24, second // 60 % 60, second % 60
+            if rng.random() < critical_ratio:
+                message = rng.choice(CRITICAL_MESSAGES)
+            else:
+                message = rng.choice(NORMAL_MESSAGES)
+            line = f'2023-08-27 {h:02d}:{m:02d}:{s:02d},INFO,{message}\n'
+            block.append(line)
+            written += len(line)
+            if len(block) >= 10000:
+                f.write(''.join(block))
+                block = []
+        f.write(''.join(block))
+
+
+def run_serial(log_path, output_path):
+    main.save_logs(main.extract_critical_logs(main.read_log(log_path)), output_path)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='미션 로그 병렬 구간 분석 벤치마크')
+    parser.add_argument('--size-gb', type=float, nargs='+', default=[1.0], help='합성 로그 크기 (GB, 여러 개 가능)')
+    parser.add_argument('--max-workers', type=int, default=cpu_count(), help='측정할 최대 프로세스 수')
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help='합성 로그를 만들 폴더')
+    args = parser.parse_args()
+
+    for size_gb in args.size_gb:
+        log_path = os.path.join(args.dir, f'synthetic_{size_gb:g}GB.log')
+        out_path = os.path.join(args.dir, 'critical_bench.log')
+        if not os.path.exists(log_path):
+            print(f'합성 로그 생성 중: {log_path}')
+            make_synthetic_log(log_path, int(size_gb * 1024 ** 3))
+        size_mb = os.path.getsize(log_path) / 1024 ** 2
+
+        start = time.perf_counter()
+        run_serial(log_path, out_path)
+        baseline = time.perf_counter() - start
+        with open(out_path, 'rb') as f:
+            expected = f.read()
+
+        print(f'\n{size_gb:g} GB ({size_mb:.0f} MB)')
+        print(f'{"mode":<14} {"seconds":>9} {"MB/s":>9} {"speedup":>9} {"per core":>9}')
+        print(f'{"serial":<14} {baseline:>9.2f} {size_mb / baseline:>9.1f} {1:>9.2f} {1:>9.2f}')
+        workers = 1
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            main.extract_critical_logs_parallel(log_path, out_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            with open(out_path, 'rb') as f:
+                assert f.read() == expected, '병렬 결과가 순차 결과와 다릅니다.'
+            speedup = baseline / elapsed
+            print(f'{f"sharded x{workers}":<14} {elapsed:>9.2f} {size_mb / elapsed:>9.1f} {speedup:>9.2f} {speedup / workers:>9.2f}')
+            workers *= 2
+        os.remove(out_path)
+
+
+if __name__ == '__main__':
+    sys.exit(main_bench())
@@ -0,0 +1,263 @@
+import os
+import sys
+import mmap
+import array
+import struct
+import bisect
+import shutil
+import calendar
+import datetime
+import tempfile
+from collections import Counter
+from heapq import merge
+from itertools import chain
+
+# 컬럼 파일 형식 (.logc)
+#   헤더: 매직, 행 수, 시간순 정렬 여부, 이벤트 종류 수, 각 컬럼 시작 위치
+#   이벤트 사전: (길이, UTF-8 문자열) 반복
+#   timestamp 컬럼: int64 (epoch 초, UTC 기준) x 행 수
+#   event 컬럼: uint16 (이벤트 사전 번호) x 행 수
+#   message 오프셋 컬럼: int64 x (행 수 + 1), message 본문: UTF-8 바이트를 이어 붙인 것
+#   시간순이 아닐 때만: 시간순 행 번호 컬럼 int64 x 행 수, 그 순서의 timestamp 컬럼 int64 x 행 수
+MAGIC = b'LOGC0001'
+HEADER = struct.Struct('<8sQBH5xQQQQQQ')
+MAX_EVENTS = 65535
+RUN_READ_ROWS = 4096
+BUFFER_ROWS = 65536
+COUNT_CHUNK = 16 * 1024 * 1024
+
+
+def parse_timestamp(text):
+    """'YYYY-MM-DD HH:MM:SS' → epoch 초 (strptime보다 빠르게 자리수로 직접 해석)"""
+    return calendar.timegm((int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                            int(text[11:13]), int(text[14:16]), int(text[17:19]), 0, 0, 0))
+
+
+def format_timestamp(epoch):
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _align(file, boundary=8):
+    pad = -file.tell() % boundary
+    file.write(b'\0' * pad)
+
+
+def build_columns(log_path, output_path=None):
+    """timestamp,event,message 로그를 한 줄씩 읽어 컬럼 파일로 변환 (메모리는 버퍼 크기만큼만 사용)
+
+    형식에 맞지 않는 줄(헤더 포함)은 건너뛰고, 건너뛴 줄 수를 함께 반환한다.
+    """
+    output_path = output_path or os.path.splitext(log_path)[0] + '.logc'
+    events = {}
+    rows = skipped = 0
+    is_sorted = True
+    last_ts = None
+    offset = 0
+
+    temp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(output_path)))
+    parts = {}
+    try:
+        for name in ('ts', 'code', 'offset', 'message'):
+            parts[name] = open(os.path.join(temp_dir, name), 'w+b')
+        ts_buf, code_buf, offset_buf = array.array('q'), array.array('H'), array.array('q', [0])
+        message_buf = []
+
+        def flush():
+            for name, buf in (('ts', ts_buf), ('code', code_buf), ('offset', offset_buf)):
+                parts[name].write(buf.tobytes())
+                del buf[:]
+            parts['message'].write(b''.join(message_buf))
+            message_buf.clear()
+
+        with open(log_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                fields = line.rstrip('\r\n').split(',', 2)
+                if len(fields) != 3:
+                    skipped += 1
+                    continue
+                try:
+                    ts = parse_timestamp(fields[0])
+                except ValueError:
+                    skipped += 1
+                    continue
+                code = events.get(fields[1])
+                if code is None:
+                    if len(events) >= MAX_EVENTS:
+                        raise ValueError(f'이벤트 종류가 {MAX_EVENTS}개를 넘습니다.')
+                    code = events[fields[1]] = len(events)
+                if last_ts is not None and ts < last_ts:
+                    is_sorted = False
+                last_ts = ts
+
+                message = fields[2].encode('utf-8')
+                offset += len(message)
+                ts_buf.append(ts)
+                code_buf.append(code)
+                offset_buf.append(offset)
+                message_buf.append(message)
+                rows += 1
+                if len(ts_buf) >= BUFFER_ROWS:
+                    flush()
+        flush()
+        parts['order'] = open(os.path.join(temp_dir, 'order'), 'w+b')
+        parts['sorted_ts'] = open(os.path.join(temp_dir, 'sorted_ts'), 'w+b')
+        if not is_sorted:
+            _sort_by_time(parts, temp_dir)
+
+        with open(output_path, 'wb') as out:
+            out.write(b'\0' * HEADER.size)
+            for name in events:
+                encoded = name.encode('utf-8')
+                out.write(struct.pack('<H', len(encoded)) + encoded)
+            positions = {}
+            for name in ('ts', 'code', 'offset', 'message', 'order', 'sorted_ts'):
+                _align(out)
+                positions[name] = out.tell()
+                parts[name].seek(0)
+                shutil.copyfileobj(parts[name], out)
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, rows, is_sorted, len(events),
+                                  positions['ts'], positions['code'], positions['offset'], positions['message'],
+                                  positions['order'], positions['sorted_ts']))
+    finally:
+        for part in parts.values():
+            part.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return output_path, rows, skipped
+
+
+def _sort_by_time(parts, temp_dir):
+    """timestamp 컬럼을 BUFFER_ROWS씩 정렬해 임시 런으로 쓰고 병합해서 시간순 행 번호/timestamp 컬럼을 만듦"""
+    runs = []
+    parts['ts'].seek(0)
+    base = 0
+    while True:
+        chunk = array.array('q')
+        chunk.frombytes(parts['ts'].read(8 * BUFFER_ROWS))
+        if not chunk:
+            break
+        run = open(os.path.join(temp_dir, f'run{len(runs)}'), 'w+b')
+        run.write(array.array('q', chain.from_iterable(sorted(zip(chunk, range(base, base + len(chunk)))))).tobytes())
+        run.seek(0)
+        runs.append(run)
+        base += len(chunk)
+
+    def read_run(run):
+        while True:
+            pairs = array.array('q')
+            pairs.frombytes(run.read(16 * RUN_READ_ROWS))
+            if not pairs:
+                return
+            yield from zip(pairs[0::2], pairs[1::2])
+
+    try:
+        order_buf, ts_buf = array.array('q'), array.array('q')
+        for ts, row in merge(*map(read_run, runs)):
+            ts_buf.append(ts)
+            order_buf.append(row)
+            if len(ts_buf) >= BUFFER_ROWS:
+                parts['sorted_ts'].write(ts_buf.tobytes())
+                parts['order'].write(order_buf.tobytes())
+                del ts_buf[:], order_buf[:]
+        parts['sorted_ts'].write(ts_buf.tobytes())
+        parts['order'].write(order_buf.tobytes())
+    finally:
+        for run in runs:
+            run.close()
+
+
+class ColumnarLog:
+    """컬럼 파일을 mmap으로 열어 복사 없이 컬럼(memoryview)을 바로 사용"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, self.rows, is_sorted, event_count, ts_pos, code_pos, offset_pos, self._message_pos, \
+            order_pos, sorted_ts_pos = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError('컬럼 로그 파일이 아닙니다.')
+        self.is_sorted = bool(is_sorted)
+
+        self.events = []
+        pos = HEADER.size
+        for _ in range(event_count):
+            (length,) = struct.unpack_from('<H', self._map, pos)
+            self.events.append(bytes(self._map[pos + 2:pos + 2 + length]).decode('utf-8'))
+            pos += 2 + length
+
+        n = self.rows
+        self.timestamps = view[ts_pos:ts_pos + 8 * n].cast('q')
+        self.codes = view[code_pos:code_pos + 2 * n].cast('H')
+        self.offsets = view[offset_pos:offset_pos + 8 * (n + 1)].cast('q')
+        if not self.is_sorted:
+            self.order = view[order_pos:order_pos + 8 * n].cast('q')
+            self.sorted_timestamps = view[sorted_ts_pos:sorted_ts_pos + 8 * n].cast('q')
+        else:
+            self.order = self.sorted_timestamps = None
+
+    def close(self):
+        for column in (self.timestamps, self.codes, self.offsets, self.order, self.sorted_timestamps):
+            if column is not None:
+                column.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    def message(self, i):
+        start = self._message_pos + self.offsets[i]
+        end = self._message_pos + self.offsets[i + 1]
+        return self._map[start:end].decode('utf-8')
+
+    def row(self, i):
+        return self.timestamps[i], self.events[self.codes[i]], self.message(i)
+
+    def format_row(self, i):
+        ts, event, message = self.row(i)
+        return f'{format_timestamp(ts)},{event},{message}'
+
+    def window(self, start_ts, end_ts):
+        """start_ts <= timestamp < end_ts 인 행 번호 (이진 탐색. 시간순이 아닌 로그는 시간순 컬럼에서 찾아 행 순서로 반환)"""
+        timestamps = self.timestamps if self.is_sorted else self.sorted_timestamps
+        lo = bisect.bisect_left(timestamps, start_ts)
+        hi = bisect.bisect_left(timestamps, end_ts, lo)
+        if self.is_sorted:
+            return range(lo, hi)
+        return sorted(self.order[lo:hi])
+
+    def event_counts(self):
+        """이벤트별 행 수 (코드 컬럼을 큰 조각 단위로 Counter에 넘겨 C 수준 속도로 처리)"""
+        counts = Counter()
+        for start in range(0, self.rows, COUNT_CHUNK):
+            counts.update(self.codes[start:start + COUNT_CHUNK])
+        return {name: counts[code] for code, name in enumerate(self.events)}
+
+    def iter_reversed(self):
+        for i in range(self.rows - 1, -1, -1):
+            yield self.format_row(i)
+
+
+if __name__ == '__main__':
+    # python log_columns.py [로그 파일] [시작 시각] [끝 시각]
+    log_path = sys.argv[1] if len(sys.argv) > 1 else 'mission_computer_main.log'
+    path, rows, skipped = build_columns(log_path)
+    print(f'{path} 생성: {rows}행 (건너뛴 줄 {skipped}개)')
+    with ColumnarLog(path) as log:
+        print('\n이벤트별 개수:')
+        for name, count in log.event_counts().items():
+            print(f'  {name}: {count}')
+        if len(sys.argv) > 3:
+            print(f'\n{sys.argv[2]} ~ {sys.argv[3]} 구간:')
+            for i in log.window(parse_timestamp(sys.argv[2]), parse_timestamp(sys.argv[3])):
+                print(log.format_row(i))
+        print('\n역순 보기:')
+        for line in log.iter_reversed():
+            print(line)
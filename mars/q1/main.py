@@ -1,15 +1,70 @@
+import os
+import re
+import sys
+import shutil
+import tempfile
+from itertools import chain
+from multiprocessing import Pool, cpu_count
+
 print('Hello Mars')
 
+# 문제가 되는 로그를 찾는 규칙 (한 줄에 하나라도 포함되면 추출)
+CRITICAL_RULES = ['Oxygen tank', 'explosion', 'powered down']
+
+# 역순 읽기 시 한 번에 읽는 블록 크기 (바이트)
+BLOCK_SIZE = 64 * 1024
+
+# 이 크기 이상의 로그는 줄 경계에 맞춘 바이트 구간으로 나눠 여러 프로세스에서 검사
+PARALLEL_THRESHOLD = 64 * 1024 * 1024
+SCAN_CHUNK = 8 * 1024 * 1024
+
 def read_log(file_path):
+    """로그를 한 줄씩 돌려주는 제너레이터 (파일 전체를 메모리에 올리지 않음)
+
+    병렬 구간 검사와 같은 결과가 나오도록 줄 구분은 '\n'으로만 하고 줄 끝 '\r'은 save_logs에서 제거한다.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='\n') as file:
+            for line in file:
+                yield line
+    except FileNotFoundError:
+        print('Error: 로그 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'오류 발생: {e}')
+
+def read_log_reversed(file_path, block_size=BLOCK_SIZE):
+    """파일 끝에서부터 고정 크기 블록 단위로 거꾸로 읽으며 마지막 줄부터 돌려주는 제너레이터"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.readlines()
+        with open(file_path, 'rb') as file:
+            position = end = file.seek(0, os.SEEK_END)
+            carry = b''  # 블록 경계에 걸린 줄의 뒷부분
+            while position > 0:
+                size = min(block_size, position)
+                position -= size
+                file.seek(position)
+                lines = (file.read(size) + carry).split(b'\n')
+                if position + size == end and lines[-1] == b'':
+                    lines.pop()  # 파일 끝 '\n' 뒤의 빈 조각만 버리고, 중간의 빈 줄은 정방향처럼 그대로 돌려줌
+                carry = lines.pop(0)  # 앞쪽 블록에 이어질 수 있으므로 보류
+                for line in reversed(lines):
+                    yield line.decode('utf-8') + '\n'
+            if end:
+                yield carry.decode('utf-8') + '\n'
     except FileNotFoundError:
         print('Error: 로그 파일을 찾을 수 없습니다.')
-        return []
     except Exception as e:
         print(f'오류 발생: {e}')
-        return []
+
+def load_rules(file_path):
+    """규칙 파일에서 한 줄에 하나씩 규칙을 읽음 (빈 줄과 #으로 시작하는 줄은 무시)"""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith('#')]
+
+def compile_rules(rules):
+    """여러 규칙을 정규식 하나로 묶어서 한 줄을 한 번만 검사하도록 함"""
+    if not rules:  # 빈 패턴은 모든 줄에 걸리므로 허용하지 않음
+        raise ValueError('추출 규칙이 비어 있습니다.')
+    return re.compile('|'.join(re.escape(rule) for rule in rules))
 
 def display_logs(logs):
     for log in logs:
@@ -18,38 +73,110 @@ def display_logs(logs):
 def analyze_logs():
     file_name = 'mission_computer_main.log'
     logs = read_log(file_name)
-    
-    if logs:
+    first = next(logs, None)
+
+    if first is not None:
         print('Mission Log Data:\n')
-        display_logs(logs)
+        display_logs(chain([first], logs))
 
 def display_logs_reversed(logs):
-    for log in reversed(logs):
-        print(log.strip())
+    """리스트 같은 시퀀스를 뒤에서부터 출력"""
+    display_logs(reversed(logs))
 
-def extract_critical_logs(logs):
-    return [log for log in logs if 'Oxygen tank' in log or 'explosion' in log or 'powered down' in log]
+def extract_critical_logs(logs, rules=CRITICAL_RULES):
+    pattern = compile_rules(rules)
+    return (log for log in logs if pattern.search(log))
 
 def save_logs(logs, output_file):
     try:
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.writelines("\n".join(logs))
+        # 운영체제와 관계없이 병렬 경로와 같은 '\n' 줄 끝으로 저장
+        with open(output_file, 'w', encoding='utf-8', newline='\n') as file:
+            for log in logs:
+                file.write(log.rstrip('\r\n') + '\n')
         print(f'문제가 되는 부분은 {output_file}에 따로 저장되었습니다.')
     except Exception as e:
         print(f'오류 발생: {e}')
 
-def process_bonus():
+def shard_offsets(file_path, shards):
+    """파일을 shards개의 바이트 구간으로 나누되, 경계는 다음 줄의 시작으로 맞춤"""
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as file:
+        for i in range(1, shards):
+            file.seek(size * i // shards)
+            file.readline()
+            bounds.append(min(file.tell(), size))
+    bounds.append(size)
+    bounds = sorted(set(bounds))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def scan_shard(task):
+    """워커: [start, end) 구간을 큰 청크로 읽어 정규식으로 한 번에 검색하고, 걸린 줄을 임시 파일에 기록"""
+    file_path, start, end, rules, temp_dir = task
+    pattern = re.compile(b'|'.join(re.escape(rule.encode('utf-8')) for rule in rules))
+    fd, temp_path = tempfile.mkstemp(dir=temp_dir, suffix='.part')
+    count = 0
+    with open(file_path, 'rb') as file, os.fdopen(fd, 'wb') as out:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = file.read(min(SCAN_CHUNK, remaining))
+            if not chunk:
+                break
+            # 청크 끝이 줄 중간이면 그 줄 끝까지 더 읽음
+            if not chunk.endswith(b'\n') and len(chunk) < remaining:
+                chunk += file.readline()[:remaining - len(chunk)]
+            remaining -= len(chunk)
+            last_line = -1
+            for match in pattern.finditer(chunk):
+                line_start = chunk.rfind(b'\n', 0, match.start()) + 1
+                if line_start == last_line:
+                    continue  # 같은 줄에서 규칙이 여러 번 걸린 경우
+                line_end = chunk.find(b'\n', match.end())
+                line_end = len(chunk) if line_end < 0 else line_end
+                out.write(chunk[line_start:line_end].rstrip(b'\r') + b'\n')
+                last_line = line_start
+                count += 1
+    return temp_path, count
+
+def extract_critical_logs_parallel(file_path, output_file, rules=CRITICAL_RULES, workers=None):
+    """큰 로그를 구간별로 병렬 검사한 뒤, 구간 순서대로 이어 붙여 원래 순서를 유지"""
+    compile_rules(rules)  # 빈 규칙은 워커를 띄우기 전에 거절
+    workers = workers or cpu_count()
+    temp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(output_file)))
+    try:
+        tasks = [(file_path, start, end, rules, temp_dir) for start, end in shard_offsets(file_path, workers * 4)]
+        with Pool(workers) as pool:
+            parts = pool.map(scan_shard, tasks)
+        with open(output_file, 'wb') as out:
+            for temp_path, _ in parts:
+                with open(temp_path, 'rb') as part:
+                    shutil.copyfileobj(part, out)
+        print(f'문제가 되는 부분은 {output_file}에 따로 저장되었습니다.')
+        return sum(count for _, count in parts)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def process_bonus(rules=CRITICAL_RULES):
     file_name = 'mission_computer_main.log'
-    logs = read_log(file_name)
-    
-    if logs:
+    logs = read_log_reversed(file_name)
+    first = next(logs, None)
+
+    if first is not None:
         print('\nMission Log Data (Reversed):\n')
-        display_logs_reversed(logs)
-        
+        display_logs(chain([first], logs))  # read_log_reversed가 이미 역순으로 돌려줌
+
         print('\nExtracting critical events...')
-        critical_logs = extract_critical_logs(logs)
-        save_logs(critical_logs, 'critical_events.log')
+        if os.path.getsize(file_name) >= PARALLEL_THRESHOLD:
+            extract_critical_logs_parallel(file_name, 'critical_events.log', rules)
+        else:
+            critical_logs = extract_critical_logs(read_log(file_name), rules)
+            save_logs(critical_logs, 'critical_events.log')
 
 if __name__ == '__main__':
+    # python main.py [규칙 파일] 로 추출 규칙을 바꿀 수 있음
+    rules = load_rules(sys.argv[1]) if len(sys.argv) > 1 else CRITICAL_RULES
+    if not rules:
+        sys.exit('Error: 규칙 파일에 추출 규칙이 없습니다.')
     analyze_logs()
-    process_bonus()
+    process_bonus(rules)
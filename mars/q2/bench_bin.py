@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import main
+
+
+def make_rows(header, items, count, seed=0, unique_names=False):
+    """원본 인벤토리 행을 무작위로 뽑아 count행을 만들고, 숫자 열은 조금씩 흔들어 값이 겹치지 않게 함"""
+    rng = random.Random(seed)
+    types = main.infer_column_types(header, items)
+    rows = []
+    for i in range(count):
+        row = list(rng.choice(items))
+        if unique_names:  # 물질 이름이 모두 다른 인벤토리 (문자열 사전이 커지는 경우)
+            row[0] = f'{row[0]} #{i}'
+        for index, kind in enumerate(types):
+            if kind != 's' and row[index] is not None:
+                row[index] = round(row[index] * rng.uniform(0.9, 1.1), 4)
+        rows.append(row)
+    return rows
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def load_csv(path):
+    header, rows = main.read_inventory(path)
+    return header, list(rows)
+
+
+def sum_csv_column(path, key):
+    header, rows = main.read_inventory(path)  # 한 줄씩 읽으며 더함
+    index = header.index(key)
+    return sum(row[index] for row in rows if row[index] is not None)
+
+
+def sum_bin_column(path, key):
+    with main.BinaryInventory(path) as inventory:
+        return sum(value for value in inventory.column(key) if value == value)  # NaN 제외
+
+
+def random_rows_csv(path, picks):
+    _, items = load_csv(path)  # CSV는 줄 위치를 알 수 없어 전체를 파싱해야 함
+    return [items[i] for i in picks]
+
+
+def random_rows_bin(path, picks):
+    with main.BinaryInventory(path) as inventory:
+        return [inventory.row(i) for i in picks]
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='인벤토리 CSV vs 이진 파일 크기/읽기 속도 비교')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='합성 행 수')
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help='합성 파일을 만들 폴더')
+    args = parser.parse_args()
+
+    header, items = load_csv('Mars_Base_Inventory_List.csv')
+    rows = make_rows(header, items, args.rows)
+    csv_path = os.path.join(args.dir, 'inventory_bench.csv')
+    paths = {'csv': csv_path}
+    main.write_csv(header, rows, csv_path)
+    for kind in ('d', 'f'):
+        paths[f'bin({kind})'] = os.path.join(args.dir, f'inventory_bench_{kind}.bin')
+        main.write_bin(header, rows, paths[f'bin({kind})'], float_format=kind)
+
+    key = 'Flammability'
+    picks = random.Random(1).sample(range(args.rows), min(1000, args.rows))
+    print(f'{args.rows}행, 열 합계 기준: {key}')
+    print(f'{"format":<10} {"size(MB)":>10} {"full load(s)":>13} {"column sum(s)":>14} {"1000 rows(s)":>13}')
+    for name, path in paths.items():
+        size = os.path.getsize(path) / 1024 ** 2
+        if name == 'csv':
+            _, full = timed(load_csv, path)
+            total, column = timed(sum_csv_column, path, key)
+            _, random_access = timed(random_rows_csv, path, picks)
+        else:
+            _, full = timed(main.read_bin, path)
+            total, column = timed(sum_bin_column, path, key)
+            _, random_access = timed(random_rows_bin, path, picks)
+        print(f'{name:<10} {size:>10.1f} {full:>13.2f} {column:>14.3f} {random_access:>13.3f}   합계={total:.1f}')
+    for path in paths.values():
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    sys.exit(main_bench())
@@ -0,0 +1,52 @@
+import os
+import sys
+import argparse
+import tempfile
+import tracemalloc
+import bench_bin
+import main
+
+
+def sorted_in_memory(path, key):
+    header, rows = main.read_inventory(path)
+    index = main.ColumnIndex(header.index(key))
+    index.extend(rows)
+    return index.rows()
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='인벤토리 외부 병합 정렬 처리량 측정')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='합성 행 수')
+    parser.add_argument('--memory-mb', type=float, nargs='+', default=[4, 16, 64], help='런 메모리 한도 (MB, 여러 개 가능)')
+    parser.add_argument('--fan-in', type=int, default=main.MERGE_FAN_IN, help='한 번에 병합할 런 수')
+    parser.add_argument('--trace-memory', action='store_true', help='tracemalloc으로 최대 메모리 측정 (느려짐)')
+    parser.add_argument('--repeated-names', action='store_true', help='물질 이름을 원본 79개에서만 뽑음 (기본: 행마다 다른 이름)')
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help='합성 파일을 만들 폴더')
+    args = parser.parse_args()
+
+    key = 'Flammability'
+    header, items = bench_bin.load_csv('Mars_Base_Inventory_List.csv')
+    csv_path = os.path.join(args.dir, 'inventory_sort_bench.csv')
+    bin_path = os.path.join(args.dir, 'inventory_sort_bench.bin')
+    main.write_csv(header, bench_bin.make_rows(header, items, args.rows, unique_names=not args.repeated_names), csv_path)
+    expected = sorted_in_memory(csv_path, key)
+    print(f'{args.rows}행, CSV {os.path.getsize(csv_path) / 1024 ** 2:.1f} MB')
+
+    print(f'{"memory(MB)":>10} {"runs":>6} {"passes":>7} {"runs(s)":>8} {"total(s)":>9} {"rows/s":>10} {"MB/s":>7} {"peak(MB)":>9} {"types":>6}')
+    for memory_mb in args.memory_mb:
+        if args.trace_memory:
+            tracemalloc.start()
+        stats = main.external_sort(csv_path, bin_path, key, memory_mb=memory_mb, fan_in=args.fan_in)
+        peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2 if args.trace_memory else float('nan')
+        tracemalloc.stop()
+        with main.BinaryInventory(bin_path) as inventory:
+            assert list(inventory.iter_typed()) == expected, '외부 정렬 결과가 메모리 정렬과 다릅니다.'
+            types = ''.join(inventory.types)
+        print(f'{memory_mb:>10g} {stats["runs"]:>6} {stats["merge_passes"]:>7} {stats["run_seconds"]:>8.2f} '
+              f'{stats["seconds"]:>9.2f} {stats["rows_per_sec"]:>10.0f} {stats["mb_per_sec"]:>7.1f} {peak:>9.1f} {types:>6}')
+    os.remove(csv_path)
+    os.remove(bin_path)
+
+
+if __name__ == '__main__':
+    sys.exit(main_bench())
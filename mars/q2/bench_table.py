@@ -0,0 +1,69 @@
+import sys
+import time
+import argparse
+import bench_bin
+import main
+from inventory_table import InventoryTable
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def danger_lists(header, rows, key, threshold):
+    items = main.filter_by_index(header, rows, key, threshold)
+    main.sort_by_index(header, items, key)
+    return items
+
+
+def danger_index(inventory, key, threshold):
+    return inventory.at_least(key, threshold)
+
+
+def danger_mask(table, key, threshold):
+    return table.filter(table[key] >= threshold).sort(key)
+
+
+def group_lists(header, rows, key, column):
+    key_index, column_index = header.index(key), header.index(column)
+    groups = {}
+    for row in rows:
+        value = row[column_index]
+        if value is not None:
+            total, count = groups.get(row[key_index], (0.0, 0))
+            groups[row[key_index]] = (total + value, count + 1)
+    return {name: total / count for name, (total, count) in groups.items()}
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description='리스트 / 정렬 색인 / NumPy 열 저장 위험 목록 비교')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000], help='합성 행 수')
+    parser.add_argument('--threshold', type=float, default=0.7)
+    args = parser.parse_args()
+
+    header, items = bench_bin.load_csv('Mars_Base_Inventory_List.csv')
+    key = 'Flammability'
+    for count in args.rows:
+        rows = bench_bin.make_rows(header, items, count)
+        inventory, index_build = timed(lambda: main.InventoryIndex(header, [key]))
+        _, extend = timed(inventory.extend, rows)
+        table, table_build = timed(InventoryTable.from_rows, header, rows)
+
+        expected, lists = timed(danger_lists, header, rows, key, args.threshold)
+        indexed, index_query = timed(danger_index, inventory, key, args.threshold)
+        masked, mask_query = timed(danger_mask, table, key, args.threshold)
+        assert indexed == expected and masked.to_rows() == expected, '위험 목록이 서로 다릅니다.'
+        _, group_list = timed(group_lists, header, rows, 'Strength', key)
+        _, group_table = timed(table.group_by, 'Strength', key)
+
+        print(f'\n{count}행 (위험 {len(expected)}행)')
+        print(f'{"method":<14} {"build(s)":>10} {"danger(ms)":>12} {"group(ms)":>11}')
+        print(f'{"lists":<14} {"-":>10} {lists * 1000:>12.1f} {group_list * 1000:>11.1f}')
+        print(f'{"sorted index":<14} {index_build + extend:>10.2f} {index_query * 1000:>12.1f} {"-":>11}')
+        print(f'{"numpy table":<14} {table_build:>10.2f} {mask_query * 1000:>12.1f} {group_table * 1000:>11.1f}')
+
+
+if __name__ == '__main__':
+    sys.exit(main_bench())
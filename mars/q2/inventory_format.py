@@ -0,0 +1,353 @@
+import os
+import math
+import mmap
+import array
+import struct
+import shutil
+import tempfile
+
+# 인벤토리 값 변환과 이진 파일(.bin) 읽기/쓰기 — main.py와 inventory_table.py가 함께 사용
+
+# 숫자로 읽을 열 (숫자가 아닌 값은 None으로 둠)
+NUMERIC_COLUMNS = ('Weight (g/cm³)', 'Specific Gravity', 'Flammability')
+NULL_MARKER = 'Various'
+
+def to_float(value):
+    """숫자로 바꿀 수 없는 값(Various 등)은 None"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+def format_value(value):
+    """None은 Various로, float는 CSV에 있던 모양(0.0 → 0)으로 되돌림"""
+    if value is None:
+        return NULL_MARKER
+    if isinstance(value, float):
+        text = repr(value)
+        return text[:-2] if text.endswith('.0') else text
+    return value
+
+# 이진 파일 형식
+#   헤더: 매직, 버전, 열 개수, 행 개수
+#   스키마: 열마다 (자료형, 이름 길이, 이름)
+#     d=float64, f=float32, s=문자열(문자열 테이블 번호, uint32), v=가변 길이 문자열
+#   문자열 테이블: 개수, 오프셋 (개수+1개, uint32), UTF-8 본문 (s 열들이 함께 사용)
+#   열 시작 위치 색인: 열마다 uint64 (i번째 행 = 열 시작 + i * 폭 → 행 단위 임의 접근)
+#   열 데이터: 8바이트 정렬, 고정 폭. 숫자가 아닌 값(Various 등)은 NaN으로 저장
+#     v 열은 uint64 오프셋 (행 수+1개) 뒤에 UTF-8 본문. 고유 문자열이 너무 많은 열(물질 이름 등)에 사용
+BIN_MAGIC = b'MINV'
+BIN_VERSION = 1
+BIN_HEADER = struct.Struct('<4sHHQ')
+BIN_WIDTHS = {'d': 8, 'f': 4, 's': 4}
+BIN_VIEW_FORMATS = {'d': 'd', 'f': 'f', 's': 'I', 'v': 'Q'}
+WRITE_BUFFER_ROWS = 65536
+
+# 문자열 열 하나가 사전(문자열 테이블)으로 기억할 최대 고유 문자열 수. 넘으면 그 열은 v 열로 바꿔서
+# 쓰는 동안 메모리가 고유 문자열 수에 따라 늘어나지 않게 함
+DICTIONARY_LIMIT = 65536
+
+def infer_column_types(header, items, float_format='d'):
+    """값이 하나라도 숫자이고 나머지가 모두 숫자 또는 빈 값/Various/None이면 숫자 열로 판단"""
+    types = []
+    for index in range(len(header)):
+        values = [item[index] for item in items if index < len(item)]
+        numeric = [to_float(v) is not None for v in values]
+        if any(numeric) and all(ok or v in (None, '', NULL_MARKER) for ok, v in zip(numeric, values)):
+            types.append(float_format)
+        else:
+            types.append('s')
+    return types
+
+def schema_types(header, float_format='d', numeric_columns=NUMERIC_COLUMNS):
+    """데이터를 보지 않고 열 이름만으로 정한 자료형 (여러 파일이 같은 스키마를 써야 할 때)"""
+    return [float_format if name in numeric_columns else 's' for name in header]
+
+class BinaryWriter:
+    """
+    행을 하나씩 받아 이진 파일을 만듦. 열마다 임시 파일에 나눠 쓰고 close()에서 한 파일로 합침
+    (메모리에는 쓰기 버퍼와, 열마다 dictionary_limit개 이하의 문자열 사전만 남음)
+    """
+    def __init__(self, filename, header, types, dictionary_limit=DICTIONARY_LIMIT, buffer_rows=WRITE_BUFFER_ROWS):
+        self.filename = filename
+        self.header = list(header)
+        self.types = list(types)
+        self.dictionary_limit = dictionary_limit
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+        self._temp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(filename)))
+        self._parts = [open(os.path.join(self._temp_dir, str(index)), 'w+b') for index in range(len(self.header))]
+        self._buffers = [array.array(BIN_VIEW_FORMATS[kind]) for kind in self.types]
+        self._dictionaries = [{} if kind == 's' else None for kind in self.types]  # 문자열 → 열 안의 번호
+        self._blobs = {}  # v 열 번호 → [본문 임시 파일, 지금까지 쓴 바이트 수, 버퍼]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self._cleanup()
+
+    def add(self, row):
+        for index, kind in enumerate(self.types):
+            value = row[index] if index < len(row) else ''
+            if kind == 's':
+                value = format_value(value)
+                ids = self._dictionaries[index]
+                string_id = ids.get(value)
+                if string_id is None:
+                    if len(ids) >= self.dictionary_limit:
+                        self._to_variable(index)
+                        kind = 'v'
+                    else:
+                        string_id = ids[value] = len(ids)
+                if kind == 's':
+                    self._buffers[index].append(string_id)
+                    continue
+            if kind == 'v':
+                encoded = format_value(value).encode()
+                blob = self._blobs[index]
+                blob[1] += len(encoded)
+                blob[2].append(encoded)
+                self._buffers[index].append(blob[1])  # 이 값이 끝나는 위치
+            else:
+                number = to_float(value)
+                self._buffers[index].append(math.nan if number is None else number)
+        self.rows += 1
+        if self.rows % self.buffer_rows == 0:
+            self._flush()
+
+    def _to_variable(self, index):
+        """사전이 가득 찬 s 열을 v 열로 바꿈: 지금까지 쓴 번호를 문자열로 풀어서 다시 쓰고 사전은 버림"""
+        self._flush()
+        encoded = [value.encode() for value in self._dictionaries[index]]  # 번호 순서 = 추가된 순서
+        old = self._parts[index]
+        new = open(os.path.join(self._temp_dir, f'{index}.offsets'), 'w+b')
+        blob_file = open(os.path.join(self._temp_dir, f'{index}.blob'), 'w+b')
+        size = 0
+        new.write(array.array('Q', [0]).tobytes())
+        old.seek(0)
+        while True:
+            chunk = old.read(WRITE_BUFFER_ROWS * 4)
+            if not chunk:
+                break
+            codes = array.array('I')
+            codes.frombytes(chunk)
+            pieces = [encoded[code] for code in codes]
+            offsets = array.array('Q')
+            for piece in pieces:
+                size += len(piece)
+                offsets.append(size)
+            new.write(offsets.tobytes())
+            blob_file.write(b''.join(pieces))
+        old.close()
+        os.remove(old.name)
+        self._parts[index] = new
+        self._buffers[index] = array.array('Q')
+        self._blobs[index] = [blob_file, size, []]
+        self._dictionaries[index] = None
+        self.types[index] = 'v'
+
+    def _flush(self):
+        for part, buffer in zip(self._parts, self._buffers):
+            part.write(buffer.tobytes())
+            del buffer[:]
+        for blob in self._blobs.values():
+            blob[0].write(b''.join(blob[2]))
+            blob[2].clear()
+
+    def _cleanup(self):
+        for part in self._parts:
+            part.close()
+        for blob in self._blobs.values():
+            blob[0].close()
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def close(self):
+        try:
+            self._flush()
+            schema = b''.join(struct.pack('<cH', kind.encode(), len(name.encode())) + name.encode()
+                              for kind, name in zip(self.types, self.header))
+            # s 열마다 따로 만든 사전을 문자열 테이블 하나로 이어 붙이고, 열마다 번호 시작 위치(base)를 기억
+            encoded, bases = [], {}
+            for index, ids in enumerate(self._dictionaries):
+                if ids is not None:
+                    bases[index] = len(encoded)
+                    encoded.extend(value.encode() for value in ids)
+            offsets = array.array('I', [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            string_table = struct.pack('<I', len(encoded)) + offsets.tobytes() + b''.join(encoded)
+
+            position = BIN_HEADER.size + len(schema) + len(string_table) + 8 * len(self.header)
+            column_offsets = array.array('Q')
+            for index, kind in enumerate(self.types):
+                position += -position % 8
+                column_offsets.append(position)
+                if kind == 'v':
+                    position += (self.rows + 1) * 8 + self._blobs[index][1]
+                else:
+                    position += self.rows * BIN_WIDTHS[kind]
+
+            with open(self.filename, 'wb') as file:
+                file.write(BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, len(self.header), self.rows))
+                file.write(schema)
+                file.write(string_table)
+                file.write(column_offsets.tobytes())
+                for index, (offset, part) in enumerate(zip(column_offsets, self._parts)):
+                    file.write(b'\0' * (offset - file.tell()))
+                    part.seek(0)
+                    if bases.get(index):
+                        self._copy_shifted(part, file, bases[index])
+                    else:
+                        shutil.copyfileobj(part, file)
+                    if index in self._blobs:
+                        self._blobs[index][0].seek(0)
+                        shutil.copyfileobj(self._blobs[index][0], file)
+        finally:
+            self._cleanup()
+
+    @staticmethod
+    def _copy_shifted(source, target, base):
+        """열 안의 번호에 base를 더해 문자열 테이블 전체 기준 번호로 바꾸며 복사"""
+        while True:
+            chunk = source.read(WRITE_BUFFER_ROWS * 4)
+            if not chunk:
+                break
+            codes = array.array('I')
+            codes.frombytes(chunk)
+            target.write(array.array('I', [code + base for code in codes]).tobytes())
+
+class BinaryInventory:
+    """
+    이진 파일을 mmap으로 열어 열 데이터를 복사 없이 memoryview로 제공
+    """
+    def __init__(self, filename):
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 빈 파일
+            self._file.close()
+            raise ValueError('이진 파일이 비어 있습니다.')
+        magic, version, column_count, self.rows = BIN_HEADER.unpack_from(self._map, 0)
+        if magic != BIN_MAGIC or version != BIN_VERSION:
+            self.close()
+            raise ValueError('인벤토리 이진 파일 형식이 아닙니다.')
+
+        position = BIN_HEADER.size
+        self.header, self.types = [], []
+        for _ in range(column_count):
+            kind, length = struct.unpack_from('<cH', self._map, position)
+            position += 3
+            self.types.append(kind.decode())
+            self.header.append(self._map[position:position + length].decode())
+            position += length
+
+        (count,) = struct.unpack_from('<I', self._map, position)
+        position += 4
+        view = memoryview(self._map)
+        self._string_offsets = view[position:position + 4 * (count + 1)].cast('I')
+        position += 4 * (count + 1)
+        self._string_base = position
+        position += self._string_offsets[count] if count else 0
+
+        column_offsets = view[position:position + 8 * column_count].cast('Q')
+        self.columns = []
+        self._blob_bases = {}  # v 열 번호 → 본문 시작 위치 (열 데이터는 오프셋 배열)
+        for index, (offset, kind) in enumerate(zip(column_offsets, self.types)):
+            if kind == 'v':
+                size = 8 * (self.rows + 1)
+                self._blob_bases[index] = offset + size
+            else:
+                size = BIN_WIDTHS[kind] * self.rows
+            self.columns.append(view[offset:offset + size].cast(BIN_VIEW_FORMATS[kind]))
+        column_offsets.release()
+        self._views = [self._string_offsets] + self.columns
+
+    def close(self):
+        for view in getattr(self, '_views', []):
+            view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    def string(self, string_id):
+        start = self._string_base + self._string_offsets[string_id]
+        end = self._string_base + self._string_offsets[string_id + 1]
+        return self._map[start:end].decode()
+
+    def strings(self):
+        """문자열 테이블 전체를 디코딩한 리스트"""
+        return [self.string(i) for i in range(len(self._string_offsets) - 1)]
+
+    def column(self, key):
+        """열 이름으로 memoryview 반환 (숫자 열은 float 값, s 열은 문자열 테이블 번호, v 열은 본문 오프셋)"""
+        return self.columns[self.header.index(key)]
+
+    def _variable_strings(self, index, start, end):
+        """v 열의 start~end 행 문자열 (본문을 한 번에 잘라서 나눔)"""
+        offsets = self.columns[index][start:end + 1].tolist()
+        if not offsets:
+            return []
+        base = self._blob_bases[index]
+        data = self._map[base + offsets[0]:base + offsets[-1]]
+        first = offsets[0]
+        return [data[a - first:b - first].decode() for a, b in zip(offsets, offsets[1:])]
+
+    def value(self, row, index):
+        if self.types[index] == 'v':
+            return self._variable_strings(index, row, row + 1)[0]
+        raw = self.columns[index][row]
+        if self.types[index] == 's':
+            return self.string(raw)
+        return self._format_number(index, raw)
+
+    def _format_number(self, index, raw):
+        if math.isnan(raw):
+            return NULL_MARKER
+        if self.types[index] == 'f':
+            return f'{raw:.7g}'  # float32는 유효 자릿수 7자리
+        return format_value(raw)
+
+    def row(self, i):
+        """i번째 행을 CSV와 같은 문자열 리스트로 복원 (열 시작 + i * 폭 위치를 바로 읽음)"""
+        return [self.value(i, index) for index in range(len(self.header))]
+
+    def decode_column(self, index):
+        """열 전체를 문자열 리스트로 복원 (문자열 테이블은 한 번만 디코딩)"""
+        if self.types[index] == 'v':
+            return self._variable_strings(index, 0, self.rows)
+        column = self.columns[index].tolist()
+        if self.types[index] == 's':
+            table = self.strings()
+            return [table[i] for i in column]
+        return [self._format_number(index, raw) for raw in column]
+
+    def iter_typed(self, chunk_rows=WRITE_BUFFER_ROWS):
+        """read_inventory와 같은 모양(숫자는 float/None)의 행을 chunk_rows개씩 풀어서 하나씩 돌려줌
+        (문자열 테이블 전체를 풀지 않고 조각에 나온 번호만 디코딩하므로 메모리는 조각 크기만큼)"""
+        for start in range(0, self.rows, chunk_rows):
+            columns = []
+            for index, (kind, view) in enumerate(zip(self.types, self.columns)):
+                if kind == 'v':
+                    columns.append(self._variable_strings(index, start, min(start + chunk_rows, self.rows)))
+                    continue
+                values = view[start:start + chunk_rows].tolist()
+                if kind == 's':
+                    cache = {}
+                    columns.append([cache[i] if i in cache else cache.setdefault(i, self.string(i)) for i in values])
+                else:
+                    columns.append([None if value != value else value for value in values])  # NaN → None
+            for row in zip(*columns):
+                yield list(row)
@@ -0,0 +1,128 @@
+import numpy as np
+import inventory_format as fmt
+
+# 인벤토리를 열마다 NumPy 배열로 저장하는 표
+#   숫자 열: float64 배열 (None/Various는 NaN)
+#   문자열 열: 사전 부호화 (정렬된 고유 문자열 배열 + int32 코드 배열)
+# 필터/정렬/그룹 집계는 모두 배열 연산으로 처리
+
+
+class InventoryTable:
+    def __init__(self, header, columns, dictionaries):
+        self.header = list(header)
+        self.columns = columns            # 이름 → 숫자 배열 또는 코드 배열
+        self.dictionaries = dictionaries  # 문자열 열 이름 → 고유 문자열 배열
+
+    @classmethod
+    def from_rows(cls, header, rows, numeric_columns=fmt.NUMERIC_COLUMNS):
+        """read_inventory의 행(숫자 열은 float/None)으로 표를 만듦"""
+        rows = rows if isinstance(rows, list) else list(rows)
+        columns, dictionaries = {}, {}
+        for index, name in enumerate(header):
+            values = [row[index] if index < len(row) else None for row in rows]
+            if name in numeric_columns:
+                columns[name] = np.array(values, dtype=np.float64)  # None → NaN
+            else:
+                values = [fmt.format_value(value) for value in values]
+                dictionaries[name], codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+                columns[name] = codes.astype(np.int32)
+        return cls(header, columns, dictionaries)
+
+    @classmethod
+    def from_bin(cls, filename):
+        """이진 파일의 열을 그대로 배열로 읽음 (문자열 열은 이미 문자열 테이블 번호로 부호화되어 있음)"""
+        columns, dictionaries = {}, {}
+        with fmt.BinaryInventory(filename) as inventory:
+            table = inventory.strings()
+            for index, (name, kind, view) in enumerate(zip(inventory.header, inventory.types, inventory.columns)):
+                if kind == 'v':  # 가변 길이 문자열 열은 풀어서 사전 부호화
+                    values = np.array(inventory.decode_column(index), dtype=object)
+                    dictionaries[name], codes = np.unique(values, return_inverse=True)
+                    columns[name] = codes.astype(np.int32)
+                elif kind == 's':
+                    codes = np.frombuffer(view, dtype=np.uint32)
+                    # 이 열에서 쓰는 문자열만 정렬된 사전으로 남기고 코드를 다시 매김
+                    used, codes = np.unique(codes, return_inverse=True)
+                    dictionaries[name], rank = np.unique(np.array([table[i] for i in used], dtype=object),
+                                                         return_inverse=True)
+                    columns[name] = rank[codes].astype(np.int32)
+                else:
+                    columns[name] = np.frombuffer(view, dtype=np.float64 if kind == 'd' else np.float32).astype(np.float64)
+            header = list(inventory.header)
+        return cls(header, columns, dictionaries)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name):
+        """숫자 열은 배열 그대로 (table['Flammability'] >= 0.7 처럼 마스크를 만들 때 사용)"""
+        return self.columns[name]
+
+    def decoded(self, name):
+        """문자열 열을 문자열 배열로 복원"""
+        return self.dictionaries[name][self.columns[name]]
+
+    def equals(self, name, value):
+        """문자열 열 == value 마스크 (문자열 비교 대신 코드 하나만 비교)"""
+        codes = np.flatnonzero(self.dictionaries[name] == value)
+        if not len(codes):
+            return np.zeros(len(self), dtype=bool)
+        return self.columns[name] == codes[0]
+
+    def take(self, positions):
+        return InventoryTable(self.header, {name: column[positions] for name, column in self.columns.items()},
+                              self.dictionaries)
+
+    def filter(self, mask):
+        return self.take(np.flatnonzero(mask))
+
+    def sort(self, key, descending=True):
+        """key 열 기준 안정 정렬 (NaN은 맨 뒤)"""
+        values = self.columns[key]  # 사전이 정렬되어 있으므로 문자열 열은 코드 순서가 곧 문자열 순서
+        order = np.argsort(-values if descending else values, kind='stable')
+        return self.take(order)
+
+    def aggregate(self, column):
+        """숫자 열의 개수/합계/평균/최소/최대 (NaN 제외)"""
+        values = self.columns[column]
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {'count': 0, 'sum': 0.0, 'mean': None, 'min': None, 'max': None}
+        return {'count': int(len(values)), 'sum': float(values.sum()), 'mean': float(values.mean()),
+                'min': float(values.min()), 'max': float(values.max())}
+
+    def group_by(self, key, column):
+        """key(문자열 열)별로 column(숫자 열)을 집계. bincount/ufunc.at으로 한 번에 계산"""
+        groups = self.dictionaries[key]
+        codes, values = self.columns[key], self.columns[column]
+        valid = ~np.isnan(values)
+        codes, values = codes[valid], values[valid]
+
+        size = len(groups)
+        counts = np.bincount(codes, minlength=size)
+        sums = np.bincount(codes, weights=values, minlength=size)
+        mins = np.full(size, np.inf)
+        maxs = np.full(size, -np.inf)
+        np.minimum.at(mins, codes, values)
+        np.maximum.at(maxs, codes, values)
+        rows = np.bincount(self.columns[key], minlength=size)
+
+        result = {}
+        for i, name in enumerate(groups):
+            count = int(counts[i])
+            result[name] = {'rows': int(rows[i]), 'count': count, 'sum': float(sums[i]),
+                            'mean': float(sums[i] / count) if count else None,
+                            'min': float(mins[i]) if count else None,
+                            'max': float(maxs[i]) if count else None}
+        return result
+
+    def to_rows(self):
+        """read_inventory와 같은 모양의 행 리스트로 변환 (NaN → None)"""
+        columns = []
+        for name in self.header:
+            if name in self.dictionaries:
+                columns.append(self.decoded(name).tolist())
+            else:
+                values = self.columns[name]
+                columns.append(np.where(np.isnan(values), None, values).tolist())
+        return [list(row) for row in zip(*columns)]
@@ -1,38 +1,68 @@
-def read_csv(filename):
+import os
+import csv
+import sys
+import time
+import heapq
+import bisect
+import array
+import struct
+import hashlib
+import shutil
+import tempfile
+import argparse
+from inventory_format import (NUMERIC_COLUMNS, to_float, format_value, infer_column_types,
+                              schema_types, BinaryWriter, BinaryInventory)
+
+def iter_csv(filename):
+    """
+    CSV를 한 줄씩 읽어 필드 리스트를 돌려주는 제너레이터 (따옴표 안의 쉼표, 줄바꿈도 처리)
     """
-    CSV 파일을 읽어 내용을 문자열로 반환하는 함수.
+    with open(filename, 'r', encoding='utf-8-sig', newline='') as file:
+        for row in csv.reader(file):
+            if row:  # 빈 줄은 건너뜀
+                yield row
+
+def read_inventory(filename, numeric_columns=NUMERIC_COLUMNS):
+    """
+    헤더와, 숫자 열을 한 번만 float로 바꾼 행을 하나씩 돌려주는 제너레이터를 반환
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            content = file.read()  # 파일의 모든 내용을 읽어옴
-            return content
+        rows = iter_csv(filename)
+        header = next(rows, None)
     except FileNotFoundError:
         print(f'파일 "{filename}"을 찾을 수 없습니다.')
-        return None
+        return None, None
     except Exception as e:
         print(f'파일을 읽는 중 오류 발생: {e}')
-        return None
-    
-def parse_csv(content):
-    """
-    CSV 내용을 파싱하여 헤더와 데이터를 리스트로 반환하는 함수.
-    """
-    try:
-        lines = content.strip().split('\n')  # 내용을 줄 단위로 분리
-        header = lines[0].strip().split(',')  # 첫 줄을 헤더로 사용
-        data_list = [line.strip().split(',') for line in lines[1:]]  # 나머지 줄을 데이터로 사용
-        return header, data_list
-    except Exception as e:
-        print(f'CSV 파싱 중 오류 발생: {e}')
-        return [], []   
+        return None, None
+    if header is None:
+        return [], iter(())
+
+    numeric = [index for index, name in enumerate(header) if name in numeric_columns]
+
+    def typed_rows():
+        for row in rows:
+            for index in numeric:
+                if index < len(row):
+                    row[index] = to_float(row[index])
+            yield row
+
+    return header, typed_rows()
+
+def print_file(filename):
+    """파일 내용을 한 줄씩 출력 (전체를 메모리에 올리지 않음)"""
+    with open(filename, 'r', encoding='utf-8-sig') as file:
+        for line in file:
+            print(line, end='')
+    print()
 
 def sort_by_index(header, items, key):
     """
-    인화성 지수를 기준으로 내림차순 정렬
+    인화성 지수를 기준으로 내림차순 정렬 (값은 읽을 때 이미 float이고, None은 0으로 취급)
     """
     try:
         index = header.index(key)  # 인화성 지수의 열 인덱스 찾기
-        items.sort(key=lambda x: float(x[index]) if x[index].replace('.', '', 1).isdigit() else 0, reverse=True)
+        items.sort(key=lambda x: 0 if x[index] is None else x[index], reverse=True)
     except ValueError:
         print(f'헤더 "{key}"가 존재하지 않습니다.')
     except Exception as e:
@@ -40,11 +70,11 @@ def sort_by_index(header, items, key):
 
 def filter_by_index(header, items, key, threshold=0.7):
     """
-    지정된 값(threshold) 이상인 항목 필터링
+    지정된 값(threshold) 이상인 항목 필터링 (items는 리스트나 read_inventory의 제너레이터)
     """
     try:
         index = header.index(key)
-        return [item for item in items if float(item[index]) >= threshold]
+        return [item for item in items if item[index] is not None and item[index] >= threshold]
     except ValueError:
         print(f'헤더 "{key}"가 없습니다.')
         return []
@@ -52,75 +82,419 @@ def filter_by_index(header, items, key, threshold=0.7):
         print(f'필터링 중 오류 발생: {e}')
         return []
 
+class ColumnIndex:
+    """
+    숫자 열 하나의 정렬 색인. 값 내림차순(같은 값은 추가된 순서)으로 유지하고 None인 행은 따로 보관
+    add()는 행을 모아 두기만 하고, 조회할 때 모인 행을 한 번에 정렬해서 기존 색인과 병합
+    """
+    def __init__(self, index):
+        self.index = index
+        self._keys = []  # -값을 오름차순으로 두어 값 내림차순이 되게 함
+        self._rows = []
+        self._nulls = []
+        self._pending = []
+
+    def __len__(self):
+        return len(self._rows) + len(self._nulls) + len(self._pending)
+
+    def add(self, row):
+        self._pending.append(row)
+
+    def extend(self, rows):
+        """여러 행을 한 번에 추가 (새 행만 정렬한 뒤 기존 색인과 병합)"""
+        self._pending.extend(rows)
+        self._settle()
+
+    def _settle(self):
+        if not self._pending:
+            return
+        new = []
+        for row in self._pending:
+            if row[self.index] is None:
+                self._nulls.append(row)
+            else:
+                new.append((-row[self.index], row))
+        self._pending = []
+        if not new:
+            return
+        new.sort(key=lambda pair: pair[0])
+        merged = list(heapq.merge(zip(self._keys, self._rows), new, key=lambda pair: pair[0]))
+        self._keys = [pair[0] for pair in merged]
+        self._rows = [pair[1] for pair in merged]
+
+    def load(self, items, order, valued):
+        """저장해 둔 행 번호 순서(order)로 색인을 복원 (앞의 valued개는 값이 있는 행, 나머지는 None인 행)"""
+        self._rows = [items[i] for i in order[:valued]]
+        self._keys = [-row[self.index] for row in self._rows]
+        self._nulls = [items[i] for i in order[valued:]]
+        self._pending = []
+
+    def order(self, positions):
+        """저장용: (행 번호 순서, 값이 있는 행 수). positions는 id(행) → 행 번호"""
+        self._settle()
+        order = array.array('I', (positions[id(row)] for row in self._rows))
+        order.extend(positions[id(row)] for row in self._nulls)
+        return order, len(self._rows)
+
+    def at_least(self, threshold):
+        """값이 threshold 이상인 행 (내림차순)"""
+        self._settle()
+        return self._rows[:bisect.bisect_right(self._keys, -threshold)]
+
+    def top(self, n):
+        self._settle()
+        return self._rows[:n]
+
+    def rows(self):
+        """전체 행을 값 내림차순으로 (None인 행은 맨 뒤)"""
+        self._settle()
+        return self._rows + self._nulls
+
+# 색인 파일 (.idx): 원본 CSV 크기와 SHA-1, 행 수, 열마다 (이름, 값이 있는 행 수, 정렬된 행 번호 uint32)
+INDEX_MAGIC = b'MIDX'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<4sHQ20sQH')
+
+def source_digest(path, size):
+    """파일 앞 size 바이트의 SHA-1과 마지막 바이트"""
+    digest = hashlib.sha1()
+    last = b''
+    with open(path, 'rb') as file:
+        remaining = size
+        while remaining > 0:
+            chunk = file.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            digest.update(chunk)
+            last = chunk[-1:]
+            remaining -= len(chunk)
+    return digest.digest(), last
+
+def valid_order(items, index, order, valued):
+    """저장된 순서가 items의 행 번호를 한 번씩만 쓰고, 값 내림차순 뒤에 None인 행이 오는지 확인"""
+    if len(set(order)) != len(items) or (order and max(order) >= len(items)):
+        return False
+    values = [items[i][index] for i in order[:valued]]
+    if None in values or any(a < b for a, b in zip(values, values[1:])):
+        return False
+    return all(items[i][index] is None for i in order[valued:])
+
+class InventoryIndex:
+    """
+    인벤토리 행과 숫자 열별 정렬 색인을 함께 관리. 정렬 순서는 .idx 파일에 저장해 두고,
+    원본 CSV가 그대로이거나 뒤에 행만 추가된 경우 다음 실행에서 다시 정렬하지 않고 새 행만 병합
+    """
+    def __init__(self, header, columns=NUMERIC_COLUMNS):
+        self.header = header
+        self.items = []
+        self.columns = {name: ColumnIndex(header.index(name)) for name in columns if name in header}
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, row):
+        self.items.append(row)
+        for column in self.columns.values():
+            column.add(row)
+
+    def extend(self, rows):
+        rows = list(rows)
+        self.items.extend(rows)
+        for column in self.columns.values():
+            column.extend(rows)
+
+    def sorted_by(self, key):
+        return self.columns[key].rows()
+
+    def at_least(self, key, threshold):
+        return self.columns[key].at_least(threshold)
+
+    def top(self, key, n):
+        return self.columns[key].top(n)
+
+    def save(self, path, source):
+        """정렬 순서를 원본 CSV의 크기/SHA-1과 함께 저장"""
+        size = os.path.getsize(source)
+        digest, _ = source_digest(source, size)
+        positions = {id(row): i for i, row in enumerate(self.items)}
+        tmp_path = path + '.tmp'  # 다 쓴 뒤에 바꿔치기해서 중간에 끊겨도 반쯤 쓴 색인이 남지 않게 함
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, size, digest, len(self.items), len(self.columns)))
+                for name, column in self.columns.items():
+                    order, valued = column.order(positions)
+                    encoded = name.encode()
+                    file.write(struct.pack('<H', len(encoded)) + encoded + struct.pack('<Q', valued))
+                    file.write(order.tobytes())
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _load(self, path, source):
+        """저장된 색인을 쓸 수 있으면 복원하고 복원한 행 수를 반환 (못 쓰면 0)"""
+        try:
+            with open(path, 'rb') as file:
+                magic, version, size, digest, rows, count = INDEX_HEADER.unpack(file.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or version != INDEX_VERSION or rows > len(self.items):
+                    return 0
+                current, last = source_digest(source, size)
+                # 원본 앞부분이 그대로이고, 줄 끝에서 끊겼을 때만 (마지막 행 뒤에 이어 쓴 경우 제외)
+                if current != digest or (os.path.getsize(source) != size and last != b'\n'):
+                    return 0
+                saved = {}
+                for _ in range(count):
+                    (length,) = struct.unpack('<H', file.read(2))
+                    name = file.read(length).decode()
+                    (valued,) = struct.unpack('<Q', file.read(8))
+                    order = array.array('I')
+                    order.frombytes(file.read(4 * rows))
+                    if len(order) != rows or valued > rows:
+                        return 0
+                    saved[name] = (order, valued)
+                if file.read(1):
+                    return 0
+        except (OSError, struct.error, ValueError):
+            return 0
+        if set(saved) != set(self.columns):
+            return 0
+        restored = self.items[:rows]
+        for name, column in self.columns.items():
+            if not valid_order(restored, column.index, *saved[name]):
+                return 0
+        for name, column in self.columns.items():
+            column.load(restored, *saved[name])
+        return rows
+
+    @classmethod
+    def open(cls, header, rows, source, path, columns=NUMERIC_COLUMNS):
+        """원본 CSV(source)의 행으로 색인을 만들되, path에 저장된 색인이 맞으면 그 순서를 재사용"""
+        inventory = cls(header, columns)
+        inventory.items = list(rows)
+        restored = inventory._load(path, source)
+        new_rows = inventory.items[restored:]
+        for column in inventory.columns.values():
+            column.extend(new_rows)
+        if new_rows or not restored:
+            try:
+                inventory.save(path, source)
+            except OSError as e:
+                print(f'색인 파일 저장 오류: {e}')
+        return inventory
+
 def write_csv(header, items, filename):
     """
-    리스트 데이터를 CSV 파일로 저장
+    리스트 데이터를 CSV 파일로 저장 (쉼표가 들어간 값은 따옴표로 감쌈)
     """
     try:
-        with open(filename, 'w') as file:
-            file.write(','.join(header) + '\n')  # 헤더 작성
+        with open(filename, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')
+            writer.writerow(header)  # 헤더 작성
             for item in items:
-                file.write(','.join(item) + '\n')
+                writer.writerow([format_value(value) for value in item])
     except Exception as e:
         print(f'CSV 파일 저장 오류: {e}')
 
-def write_bin(header, items, filename):
+def write_bin(header, items, filename, float_format='d', types=None):
     """
-    정렬된 리스트를 이진 파일로 저장
+    정렬된 리스트를 스키마 + 문자열 테이블 + 고정 폭 열로 구성된 이진 파일로 저장
     """
     try:
-        with open(filename, 'wb') as file:
-            file.write(','.join(header).encode() + b'\n')
+        types = types or infer_column_types(header, items, float_format)
+        with BinaryWriter(filename, header, types) as writer:
             for item in items:
-                file.write(','.join(item).encode() + b'\n')
+                writer.add(item)
     except Exception as e:
         print(f'이진 파일 저장 오류: {e}')
 
+
 def read_bin(filename):
     """
-    이진 파일을 읽어 리스트로 반환
+    이진 파일을 읽어 [헤더, 행...] 리스트로 반환
     """
     try:
-        with open(filename, 'rb') as file:
-            return [line.decode().strip().split(',') for line in file.readlines()]            
+        with BinaryInventory(filename) as inventory:
+            columns = [inventory.decode_column(index) for index in range(len(inventory.header))]
+            return [list(inventory.header)] + [list(row) for row in zip(*columns)]
     except Exception as e:
         print(f'이진 파일 읽기 오류: {e}')
         return []
 
+# 외부 정렬: 메모리 한도만큼 행을 모아 정렬한 런(run)을 이진 파일로 쓰고, 런들을 k-way 병합
+EXTERNAL_MEMORY_MB = 64
+MERGE_FAN_IN = 64
+
+def descending_key(index):
+    """값 내림차순, None은 맨 뒤 (ColumnIndex.rows()와 같은 순서)"""
+    return lambda row: (True, 0) if row[index] is None else (False, -row[index])
+
+def estimate_row_bytes(row):
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+def merge_runs(paths, output, header, types, order, chunk_rows, **writer_options):
+    """정렬된 런 파일들을 heapq.merge로 합쳐 output에 씀 (같은 값이면 앞 런의 행이 먼저 → 안정 정렬)"""
+    inventories = []
+    try:
+        for path in paths:
+            inventories.append(BinaryInventory(path))
+        with BinaryWriter(output, header, types, **writer_options) as writer:
+            for row in heapq.merge(*(inventory.iter_typed(chunk_rows) for inventory in inventories), key=order):
+                writer.add(row)
+    finally:
+        for inventory in inventories:
+            inventory.close()
+
+def external_sort(input_csv, output_bin, key='Flammability', memory_mb=EXTERNAL_MEMORY_MB,
+                  fan_in=MERGE_FAN_IN, float_format='d'):
+    """
+    메모리보다 큰 CSV를 key 열 내림차순으로 정렬해 이진 파일로 저장하고 처리량 통계를 반환
+    """
+    start = time.perf_counter()
+    header, rows = read_inventory(input_csv)
+    if header is None:
+        return None
+    if key not in header:
+        print(f'헤더 "{key}"가 존재하지 않습니다.')
+        return None
+    if key not in NUMERIC_COLUMNS:
+        print(f'헤더 "{key}"는 숫자 열이 아니라 정렬 기준으로 쓸 수 없습니다. ({", ".join(NUMERIC_COLUMNS)})')
+        return None
+    order = descending_key(header.index(key))
+    types = schema_types(header, float_format)
+    budget = int(memory_mb * 1024 * 1024)
+
+    temp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(output_bin)))
+    try:
+        runs, buffer = [], []
+        run_rows, count = None, 0
+        # 쓰기 버퍼와 문자열 사전도 런 크기에 맞춰 제한 (고유 이름이 많아도 메모리가 한도를 넘지 않게)
+        writer_options = {}
+
+        def spill(rows_to_write):
+            path = os.path.join(temp_dir, f'run_{len(runs)}.bin')
+            with BinaryWriter(path, header, types, **writer_options) as writer:
+                for row in rows_to_write:
+                    writer.add(row)
+            return path
+
+        for row in rows:
+            if run_rows is None:
+                run_rows = max(1, budget // estimate_row_bytes(row))
+                limit = max(256, run_rows // 4)
+                writer_options.update(dictionary_limit=limit, buffer_rows=limit)
+            buffer.append(row)
+            count += 1
+            if len(buffer) >= run_rows:
+                buffer.sort(key=order)
+                runs.append(spill(buffer))
+                buffer.clear()
+        run_rows = run_rows or 1
+        buffer.sort(key=order)
+
+        if not runs:  # 한 번에 메모리에 들어가면 런 없이 바로 저장
+            with BinaryWriter(output_bin, header, types, **writer_options) as writer:
+                for row in buffer:
+                    writer.add(row)
+            buffer.clear()
+            run_count, passes = 1, 0
+            split = time.perf_counter()
+        else:
+            if buffer:
+                runs.append(spill(buffer))
+                buffer.clear()
+            run_count, passes = len(runs), 1
+            split = time.perf_counter()
+            while len(runs) > fan_in:  # 한 번에 열 파일 수를 넘으면 여러 단계로 병합
+                next_runs = []
+                for group_start in range(0, len(runs), fan_in):
+                    group = runs[group_start:group_start + fan_in]
+                    path = os.path.join(temp_dir, f'merge_{passes}_{group_start}.bin')
+                    merge_runs(group, path, header, types, order, max(1, run_rows // len(group)), **writer_options)
+                    for done in group:
+                        os.remove(done)
+                    next_runs.append(path)
+                runs = next_runs
+                passes += 1
+            merge_runs(runs, output_bin, header, types, order, max(1, run_rows // len(runs)), **writer_options)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(input_csv)
+    return {
+        'rows': count,
+        'runs': run_count,
+        'run_rows': run_rows,
+        'merge_passes': passes,
+        'run_seconds': split - start,
+        'seconds': elapsed,
+        'rows_per_sec': count / elapsed if elapsed else 0.0,
+        'mb_per_sec': size / 1024 ** 2 / elapsed if elapsed else 0.0,
+    }
+
+def print_sort_stats(stats):
+    print(f"행 {stats['rows']}개, 런 {stats['runs']}개 (런당 최대 {stats['run_rows']}행), 병합 {stats['merge_passes']}단계")
+    print(f"런 생성 {stats['run_seconds']:.2f}초, 전체 {stats['seconds']:.2f}초 "
+          f"({stats['rows_per_sec']:.0f}행/초, {stats['mb_per_sec']:.1f} MB/초)")
+
+def load_table_class():
+    """numpy가 설치되어 있으면 InventoryTable, 없으면 None (정렬 색인으로 처리)"""
+    try:
+        from inventory_table import InventoryTable
+    except ImportError:
+        return None
+    return InventoryTable
+
+INDEX_FILENAME = 'Mars_Base_Inventory_List.idx'
+
 def main():
     filename = 'Mars_Base_Inventory_List.csv'
-    content = read_csv(filename)  # 파일을 읽음
-    if content is None: # 파일을 읽지 못한 경우
+    header, rows = read_inventory(filename)  # 헤더와 행 제너레이터 (행은 순회할 때 읽음)
+    if header is None: # 파일을 읽지 못한 경우
         print("파일을 읽을 수 없으므로 프로그램을 종료합니다.") 
         return
     
-    print("\n {filename} 내용:")
-    print(content)
+    print(f"\n {filename} 내용:")
+    print_file(filename)
     
-    header, items = parse_csv(content)  # 내용을 파싱하여 헤더와 데이터를 얻음
+    # 숫자 열마다 정렬 색인 (지난 실행에서 저장한 순서가 맞으면 다시 정렬하지 않음)
+    inventory = InventoryIndex.open(header, rows, filename, INDEX_FILENAME)
     
     print('\n리스트로 변환된 내용:')
-    for item in items:
-        print(item)
-
-    
-    print('\n리스트로 변환된 내용:')
-    for item in items:
+    for item in inventory.items:
         print(item)
     
     fire_index = 'Flammability'  
-    sort_by_index(header, items, fire_index)
+    items = inventory.sorted_by(fire_index)
     print('\n인화성 지수 기준 정렬된 목록:')
     for item in items:
         print(item)
     
-    high_fire_items = filter_by_index(header, items, fire_index, 0.7)
+    high_fire_items = inventory.at_least(fire_index, 0.7)
     print('\n인화성 지수 0.7 이상:')
     for item in high_fire_items:
         print(item)
     
+    print('\n인화성 지수 상위 5개:')
+    for item in inventory.top(fire_index, 5):
+        print(item)
+    
     danger_filename = 'Mars_Base_Inventory_danger.csv'
-    write_csv(header, high_fire_items, danger_filename)
+    InventoryTable = load_table_class()
+    if InventoryTable is not None:
+        # numpy가 있으면 열 배열 + 불리언 마스크로 위험 목록과 강도별 집계를 만듦
+        table = InventoryTable.from_rows(header, inventory.items)
+        danger = table.filter(table[fire_index] >= 0.7).sort(fire_index)
+        write_csv(header, danger.to_rows(), danger_filename)
+        print('\n강도별 인화성 지수:')
+        for strength, stats in table.group_by('Strength', fire_index).items():
+            if stats['count']:
+                print(f"{strength}: {stats['rows']}개, 평균 {stats['mean']:.2f}, 최대 {stats['max']:.2f}")
+            else:
+                print(f"{strength}: {stats['rows']}개, 인화성 지수 없음")
+    else:
+        write_csv(header, high_fire_items, danger_filename)
     print(f'\n인화성 높은 목록 "{danger_filename}" 저장 완료.')
     
     bin_filename = 'Mars_Base_Inventory_List.bin'
@@ -137,4 +511,15 @@ def main():
     print("이진 파일은 저장 공간을 절약하고 속도가 빠르지만 사람이 직접 읽기 어려움.")
 
 if __name__ == '__main__':
-    main()
+    # python main.py --external-sort 입력.csv 출력.bin [--memory-mb 64] : 메모리보다 큰 인벤토리 정렬
+    parser = argparse.ArgumentParser(description='화성 기지 인벤토리 정리')
+    parser.add_argument('--external-sort', nargs=2, metavar=('CSV', 'BIN'), help='외부 병합 정렬로 이진 파일 생성')
+    parser.add_argument('--key', default='Flammability', help='정렬 기준 숫자 열 (내림차순)')
+    parser.add_argument('--memory-mb', type=float, default=EXTERNAL_MEMORY_MB, help='런 하나에 쓸 메모리 (MB)')
+    args = parser.parse_args()
+    if args.external_sort:
+        stats = external_sort(*args.external_sort, key=args.key, memory_mb=args.memory_mb)
+        if stats:
+            print_sort_stats(stats)
+    else:
+        main()